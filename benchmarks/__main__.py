@@ -0,0 +1,52 @@
+import argparse
+import importlib
+import pkgutil
+import sys
+
+import benchmarks
+from benchmarks import runner
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks",
+        description="CIDR-Man performance benchmarks (vs built-in ipaddress)",
+    )
+    parser.add_argument("-k", dest="pattern", default="", help="run matching names")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--json", dest="output", help="save results as JSON")
+    parser.add_argument("--compare", help="JSON results of a previous run")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="relative slowdown reported as a regression (default 0.1)",
+    )
+    args = parser.parse_args(argv)
+
+    for module in pkgutil.iter_modules(benchmarks.__path__):
+        if module.name.startswith("bench_"):
+            importlib.import_module(f"benchmarks.{module.name}")
+
+    print(runner.header())
+    results = runner.run(
+        args.pattern, args.repeat, lambda result: print(runner.format_result(result))
+    )
+    if args.output:
+        runner.save(args.output, results)
+    if args.compare:
+        regressions = 0
+        print()
+        for result, change in runner.compare(args.compare, results):
+            flag = ""
+            if change > args.threshold:
+                flag = "  REGRESSION"
+                regressions += 1
+            print(f"{result.name:<40} {change * 100:+8.1f}%{flag}")
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
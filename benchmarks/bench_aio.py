@@ -0,0 +1,54 @@
+import asyncio
+import time
+
+from cidr_man import PrefixIndex
+from cidr_man.aio import enrich, process_executor
+
+from benchmarks.runner import Case, measurement_benchmark
+
+RECORDS = 100000
+PREFIXES = 10000
+
+
+def _index() -> PrefixIndex:
+    return PrefixIndex.from_unsorted(
+        (f"{10 + (i >> 8)}.{i & 255}.0.0/16", i) for i in range(PREFIXES)
+    )
+
+
+def _records():
+    return [f"{10 + (i % 40)}.{i % 256}.{i % 7}.{i % 250}" for i in range(RECORDS)]
+
+
+async def _source(records):
+    for record in records:
+        yield record
+
+
+async def _drain(records, index, **kwargs) -> float:
+    start = time.perf_counter()
+    async for _ in enrich(_source(records), index, **kwargs):
+        pass
+    return time.perf_counter() - start
+
+
+@measurement_benchmark("aio/enrich_per_record")
+def enrich_per_record():
+    # Sustained records/sec is 1 / the reported time per record
+    index = _index()
+    records = _records()
+    return Case(lambda: asyncio.run(_drain(records, index)), None, RECORDS)
+
+
+@measurement_benchmark("aio/enrich_per_record/processes")
+def enrich_processes():
+    # The index is sent to the workers once, only the batches (and their
+    # results) are pickled. Includes starting the workers.
+    index = _index()
+    records = _records()
+
+    def run():
+        with process_executor(index) as executor:
+            return asyncio.run(_drain(records, index, executor=executor))
+
+    return Case(run, None, RECORDS)
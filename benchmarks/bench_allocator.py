@@ -0,0 +1,60 @@
+from ipaddress import ip_network
+from itertools import islice
+
+from cidr_man import Allocator
+
+from benchmarks.runner import Case, benchmark
+
+POOL = "2001:db8::/48"
+SIZE = 10000
+
+
+def _allocate(prefix_len: int, size: int = SIZE):
+    allocator = Allocator(POOL)
+    return [allocator.allocate(prefix_len) for _ in range(size)]
+
+
+@benchmark("allocator/allocate/64/v6")
+def allocate():
+    # The built-in has no allocator, the closest is walking the pool's
+    # subnets in order.
+    pool = ip_network(POOL)
+    return Case(
+        lambda: _allocate(64),
+        lambda: list(islice(pool.subnets(new_prefix=64), SIZE)),
+        SIZE,
+    )
+
+
+@benchmark("allocator/allocate/mixed/v6")
+def allocate_mixed():
+    def run():
+        allocator = Allocator(POOL)
+        for i in range(SIZE):
+            allocator.allocate(62 + i % 3)
+
+    return Case(run, None, SIZE)
+
+
+@benchmark("allocator/churn/64/v6")
+def churn():
+    # Releasing and re-allocating in a fragmented pool
+    allocator = Allocator(POOL)
+    prefixes = [allocator.allocate(64) for _ in range(SIZE)][::2]
+
+    def run():
+        for prefix in prefixes:
+            allocator.release(prefix)
+        for _ in prefixes:
+            allocator.allocate(64)
+
+    return Case(run, None, len(prefixes) * 2)
+
+
+@benchmark("allocator/restore/64/v6")
+def restore():
+    allocator = Allocator(POOL)
+    for _ in range(SIZE):
+        allocator.allocate(64)
+    data = allocator.to_bytes()
+    return Case(lambda: Allocator.from_bytes(data), None, SIZE)
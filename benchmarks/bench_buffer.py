@@ -0,0 +1,54 @@
+from ipaddress import IPv4Address, IPv6Address
+
+from cidr_man import CIDR, Version
+
+from benchmarks.runner import Case, benchmark
+
+SIZE = 10000
+# A NetFlow v5 record is 48 bytes with the source address first, an IPv6
+# packet header is 40 bytes with the source address at offset 8.
+LAYOUTS = {
+    "v4": (Version.v4, 4, 48, 0, IPv4Address),
+    "v6": (Version.v6, 16, 40, 8, IPv6Address),
+}
+
+
+def _records(size: int, length: int, stride: int, offset: int) -> bytes:
+    records = bytearray(size * stride)
+    for i in range(size):
+        address = (i * 2654435761) % (1 << (length * 8))
+        start = i * stride + offset
+        records[start : start + length] = address.to_bytes(length, "big")
+    return bytes(records)
+
+
+def _register(family: str):
+    version, length, stride, offset, builtin_address = LAYOUTS[family]
+
+    @benchmark(f"from_buffer/{family}")
+    def from_buffer():
+        records = _records(SIZE, length, stride, offset)
+        starts = range(offset, SIZE * stride, stride)
+        return Case(
+            lambda: CIDR.from_buffer(records, version, SIZE, stride, offset),
+            lambda: [builtin_address(records[i : i + length]) for i in starts],
+            SIZE,
+        )
+
+    @benchmark(f"from_buffer/slice_bytes/{family}")
+    def slice_bytes():
+        view = memoryview(_records(SIZE, length, stride, offset))
+        starts = range(offset, SIZE * stride, stride)
+        return Case(
+            lambda: [CIDR(bytes(view[i : i + length])) for i in starts], None, SIZE
+        )
+
+    @benchmark(f"from_buffer/memoryview/{family}")
+    def memoryview_():
+        view = memoryview(_records(SIZE, length, stride, offset))
+        starts = range(offset, SIZE * stride, stride)
+        return Case(lambda: [CIDR(view[i : i + length]) for i in starts], None, SIZE)
+
+
+_register("v4")
+_register("v6")
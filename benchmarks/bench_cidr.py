@@ -0,0 +1,265 @@
+from copy import copy
+from ipaddress import IPv4Address, IPv6Address, ip_network
+
+from cidr_man import CIDR, Version, common_prefix_lens, common_supernet, sort_key
+from cidr_man.cidr import _convert_str
+
+from benchmarks.runner import Case, benchmark, memory_benchmark
+
+SIZE = 1000
+FLAGS = (
+    "is_global",
+    "is_private",
+    "is_reserved",
+    "is_link_local",
+    "is_loopback",
+    "is_multicast",
+)
+
+
+def v4_networks(size: int = SIZE):
+    return [f"{10 + (i >> 16)}.{(i >> 8) & 255}.{i & 255}.0/24" for i in range(size)]
+
+
+def v6_networks(size: int = SIZE):
+    return [f"2001:db8:{i:x}::/48" for i in range(size)]
+
+
+def v4_addresses(size: int = SIZE):
+    # Spread over the whole space so that every flag sees hits and misses
+    return [(i * 4294967291) % (1 << 32) for i in range(size)]
+
+
+def v6_addresses(size: int = SIZE):
+    step = (1 << 128) // size
+    return [i * step + i for i in range(size)]
+
+
+DATA = {
+    "v4": (v4_networks, v4_addresses, IPv4Address, Version.v4),
+    "v6": (v6_networks, v6_addresses, IPv6Address, Version.v6),
+}
+
+
+def _register(family: str):
+    networks, addresses, builtin_address, version = DATA[family]
+
+    @benchmark(f"init/str/{family}")
+    def init_str():
+        values = networks()
+        return Case(
+            lambda: [CIDR(value) for value in values],
+            lambda: [ip_network(value) for value in values],
+            SIZE,
+        )
+
+    @benchmark(f"init/str_uncached/{family}")
+    def init_str_uncached():
+        values = networks()
+        return Case(
+            lambda: [CIDR(value) for value in values],
+            lambda: [ip_network(value) for value in values],
+            SIZE,
+            _convert_str.cache_clear,
+        )
+
+    @benchmark(f"init/int/{family}")
+    def init_int():
+        values = addresses()
+        return Case(
+            lambda: [CIDR(value, version) for value in values],
+            lambda: [builtin_address(value) for value in values],
+            SIZE,
+        )
+
+    @benchmark(f"init/bytes/{family}")
+    def init_bytes():
+        length = 4 if version == Version.v4 else 16
+        values = [value.to_bytes(length, "big") for value in addresses()]
+        return Case(
+            lambda: [CIDR(value) for value in values],
+            lambda: [builtin_address(value) for value in values],
+            SIZE,
+        )
+
+    @benchmark(f"init/builtin/{family}")
+    def init_builtin():
+        values = [ip_network(value) for value in networks()]
+        return Case(lambda: [CIDR(value) for value in values], None, SIZE)
+
+    @benchmark(f"contains/{family}")
+    def contains():
+        values = networks()
+        subnets = [CIDR(value).left for value in values]
+        supernets = [CIDR(value).supernet() for value in values]
+        pairs = list(zip(supernets, subnets))
+        subnets_b = [ip_network(value).subnets().__next__() for value in values]
+        supernets_b = [ip_network(value).supernet() for value in values]
+        pairs_b = list(zip(supernets_b, subnets_b))
+        return Case(
+            lambda: [subnet in supernet for supernet, subnet in pairs],
+            lambda: [subnet.subnet_of(supernet) for supernet, subnet in pairs_b],
+            SIZE,
+        )
+
+    @benchmark(f"subnets/{family}")
+    def subnets():
+        values = [CIDR(value) for value in networks()]
+        values_b = [ip_network(value) for value in networks()]
+        return Case(
+            lambda: [value.subnets() for value in values],
+            lambda: [tuple(value.subnets()) for value in values_b],
+            SIZE,
+        )
+
+    @benchmark(f"supernet/{family}")
+    def supernet():
+        values = [CIDR(value) for value in networks()]
+        values_b = [ip_network(value) for value in networks()]
+        return Case(
+            lambda: [value.supernet() for value in values],
+            lambda: [value.supernet() for value in values_b],
+            SIZE,
+        )
+
+    @benchmark(f"add/{family}")
+    def add():
+        values = [CIDR(value, version) for value in addresses()]
+        values_b = [builtin_address(value) for value in addresses()]
+        return Case(
+            lambda: [value + 1 for value in values],
+            lambda: [value + 1 for value in values_b],
+            SIZE,
+        )
+
+    @benchmark(f"next_prefix/{family}")
+    def next_prefix():
+        values = [CIDR(value) for value in networks()]
+        return Case(lambda: [value.next_prefix() for value in values], None, SIZE)
+
+    @benchmark(f"ancestor/{family}")
+    def ancestor():
+        values = [CIDR(value) for value in networks()]
+        values_b = [ip_network(value) for value in networks()]
+        return Case(
+            lambda: [value.ancestor(16) for value in values],
+            lambda: [value.supernet(new_prefix=16) for value in values_b],
+            SIZE,
+        )
+
+    def supernet_walk(a, b, contains):
+        while not contains(a, b):
+            a = a.supernet()
+        return a
+
+    def spread_pairs():
+        # Neighbours far apart, so walks take several supernet() steps
+        values = networks()
+        return list(zip(values, values[SIZE // 3 :] + values[: SIZE // 3]))
+
+    @benchmark(f"common_supernet/{family}")
+    def common_supernet_():
+        pairs = [(CIDR(a), CIDR(b)) for a, b in spread_pairs()]
+        pairs_b = [(ip_network(a), ip_network(b)) for a, b in spread_pairs()]
+
+        def contains(supernet, subnet):
+            return subnet.subnet_of(supernet)
+
+        return Case(
+            lambda: [common_supernet(a, b) for a, b in pairs],
+            lambda: [supernet_walk(a, b, contains) for a, b in pairs_b],
+            SIZE,
+        )
+
+    @benchmark(f"common_supernet/walk/{family}")
+    def common_supernet_walk():
+        pairs = [(CIDR(a), CIDR(b)) for a, b in spread_pairs()]
+
+        def contains(supernet, subnet):
+            return subnet in supernet
+
+        return Case(
+            lambda: [supernet_walk(a, b, contains) for a, b in pairs], None, SIZE
+        )
+
+    @benchmark(f"common_prefix_lens/{family}")
+    def common_prefix_lens_():
+        values = [CIDR(value) for value in networks()]
+        return Case(lambda: common_prefix_lens(values), None, SIZE)
+
+    @benchmark(f"compressed/{family}")
+    def compressed():
+        values = addresses()
+        return Case(
+            lambda: [CIDR(value, version).compressed for value in values],
+            lambda: [builtin_address(value).compressed for value in values],
+            SIZE,
+        )
+
+    @benchmark(f"packed/{family}")
+    def packed():
+        values = addresses()
+        return Case(
+            lambda: [CIDR(value, version).packed for value in values],
+            lambda: [builtin_address(value).packed for value in values],
+            SIZE,
+        )
+
+    for flag in FLAGS:
+
+        def flag_setup(flag=flag):
+            # Fresh objects every call, otherwise both libraries serve the
+            # flag from a cache.
+            values = addresses()
+            return Case(
+                lambda: [getattr(CIDR(value, version), flag) for value in values],
+                lambda: [getattr(builtin_address(value), flag) for value in values],
+                SIZE,
+            )
+
+        benchmark(f"flags/{flag}/{family}")(flag_setup)
+
+    @benchmark(f"copy/{family}")
+    def copy_():
+        values = [CIDR(value) for value in networks()]
+        values_b = [ip_network(value) for value in networks()]
+        return Case(
+            lambda: [value.copy() for value in values],
+            lambda: [copy(value) for value in values_b],
+            SIZE,
+        )
+
+    @benchmark(f"hash/{family}")
+    def hash_():
+        values = [CIDR(value) for value in networks()]
+        values_b = [ip_network(value) for value in networks()]
+        return Case(
+            lambda: [hash(value) for value in values],
+            lambda: [hash(value) for value in values_b],
+            SIZE,
+        )
+
+    @benchmark(f"sort/{family}")
+    def sort():
+        # CIDR comparisons are containment based, so sorting goes through
+        # the integer sort_key.
+        values = [CIDR(value) for value in reversed(networks())]
+        values_b = [ip_network(value) for value in reversed(networks())]
+        return Case(
+            lambda: sorted(values, key=sort_key),
+            lambda: sorted(values_b),
+            SIZE,
+        )
+
+    @memory_benchmark(f"memory/{family}")
+    def memory():
+        values = addresses()
+        return Case(
+            lambda: [CIDR(value, version) for value in values],
+            lambda: [builtin_address(value) for value in values],
+            SIZE,
+        )
+
+
+_register("v4")
+_register("v6")
@@ -0,0 +1,103 @@
+from ipaddress import IPv4Address, IPv6Address, ip_address, ip_network
+
+from cidr_man import CIDR, normalize_ipv4
+
+from benchmarks.runner import Case, benchmark
+
+SIZE = 1000
+NAT64 = ip_network("64:ff9b::/96")
+
+
+def _v4_ints(size: int = SIZE):
+    return [(i * 4294967291) % (1 << 32) for i in range(size)]
+
+
+def _cases(embed):
+    addresses = [embed(value) for value in _v4_ints()]
+    return [CIDR(value) for value in addresses], [ip_address(v) for v in addresses]
+
+
+@benchmark("conversions/ipv4_mapped")
+def ipv4_mapped():
+    values, values_b = _cases(lambda value: f"::ffff:{IPv4Address(value)}")
+    return Case(
+        lambda: [value.ipv4_mapped for value in values],
+        lambda: [value.ipv4_mapped for value in values_b],
+        SIZE,
+    )
+
+
+@benchmark("conversions/sixtofour")
+def sixtofour():
+    values, values_b = _cases(
+        lambda value: str(IPv6Address((0x2002 << 112) | (value << 80)))
+    )
+    return Case(
+        lambda: [value.sixtofour for value in values],
+        lambda: [value.sixtofour for value in values_b],
+        SIZE,
+    )
+
+
+@benchmark("conversions/teredo")
+def teredo():
+    values, values_b = _cases(
+        lambda value: str(IPv6Address((0x20010000 << 96) | (value << 64) | value))
+    )
+    return Case(
+        lambda: [value.teredo for value in values],
+        lambda: [value.teredo for value in values_b],
+        SIZE,
+    )
+
+
+@benchmark("conversions/to_ipv4_mapped")
+def to_ipv4_mapped():
+    values = [CIDR(value, 4) for value in _v4_ints()]
+    values_b = [IPv4Address(value) for value in _v4_ints()]
+    return Case(
+        lambda: [value.to_ipv4_mapped() for value in values],
+        lambda: [IPv6Address(0xFFFF00000000 | int(value)) for value in values_b],
+        SIZE,
+    )
+
+
+@benchmark("conversions/nat64")
+def nat64():
+    values, values_b = _cases(lambda value: f"64:ff9b::{IPv4Address(value)}")
+    return Case(
+        lambda: [value.nat64() for value in values],
+        lambda: [IPv4Address(int(value) & 0xFFFFFFFF) for value in values_b],
+        SIZE,
+    )
+
+
+def _builtin_normalize(addresses):
+    # The string based normalization this library replaces
+    result = []
+    for address in addresses:
+        address = ip_address(address)
+        if address.version == 6:
+            if address.ipv4_mapped is not None:
+                address = address.ipv4_mapped
+            elif address in NAT64:
+                address = IPv4Address(int(address) & 0xFFFFFFFF)
+            elif address.sixtofour is not None:
+                address = address.sixtofour
+        result.append(address)
+    return result
+
+
+@benchmark("conversions/normalize_ipv4")
+def normalize():
+    batch = [
+        "::ffff:192.0.2.1",
+        "64:ff9b::198.51.100.7",
+        "2002:cb00:7101::1",
+        "2001:db8::1",
+    ] * (SIZE // 4)
+    return Case(
+        lambda: normalize_ipv4(batch),
+        lambda: _builtin_normalize(batch),
+        SIZE,
+    )
@@ -0,0 +1,50 @@
+import time
+
+from cidr_man import CIDR, Version, diff_prefixes
+
+from benchmarks.runner import Case, measurement_benchmark
+
+ENTRIES = 1000000
+
+
+def _snapshots(size: int = ENTRIES):
+    # A full table of /24s, where the new snapshot withdraws 1%, adds a
+    # more specific /25 to 1%, aggregates every 10th /16 and announces some
+    # new IPv6 space.
+    old = []
+    new = []
+    for i in range(size):
+        ip = (1 << 24) + (i << 8)
+        if i % 2560 == 0:
+            new.append(CIDR.from_normalized(ip, Version.v4, 16))
+        prefix = CIDR.from_normalized(ip, Version.v4, 24)
+        old.append(prefix)
+        if i % 100 != 1:
+            new.append(prefix)
+        if i % 100 == 50:
+            new.append(CIDR.from_normalized(ip, Version.v4, 25))
+    for i in range(size // 100):
+        new.append(CIDR.from_normalized((0x20010DB8 << 96) | (i << 80), Version.v6, 48))
+    return old, new
+
+
+def _timed(old, new) -> float:
+    start = time.perf_counter()
+    for _ in diff_prefixes(old, new):
+        pass
+    return time.perf_counter() - start
+
+
+@measurement_benchmark("diff/1M")
+def diff():
+    old, new = _snapshots()
+    return Case(lambda: _timed(old, new), None, len(old) + len(new))
+
+
+@measurement_benchmark("diff/1M/str")
+def diff_str():
+    # Snapshots read as text lines, parsing included
+    old, new = _snapshots()
+    old = [f"{prefix}\n" for prefix in old]
+    new = [f"{prefix}\n" for prefix in new]
+    return Case(lambda: _timed(old, new), None, len(old) + len(new))
@@ -0,0 +1,36 @@
+import os
+import subprocess
+import sys
+
+import cidr_man
+
+from benchmarks.runner import Case, measurement_benchmark
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(cidr_man.__file__)))
+
+
+def import_time(module: str) -> float:
+    # Cumulative import time of module in a fresh interpreter, as reported by
+    # python -X importtime (microseconds, written to stderr).
+    env = dict(os.environ)
+    # Measure the usual installed case where bytecode is cached
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [ROOT, env.get("PYTHONPATH")]))
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        env=env,
+        stderr=subprocess.PIPE,
+        stdout=subprocess.DEVNULL,
+        universal_newlines=True,
+        check=True,
+    )
+    for line in process.stderr.splitlines():
+        parts = line.split("|")
+        if len(parts) == 3 and parts[2].strip() == module:
+            return int(parts[1]) / 1e6
+    raise ValueError(f"{module} not found in -X importtime output")
+
+
+@measurement_benchmark("import/cidr_man")
+def import_cidr_man():
+    return Case(lambda: import_time("cidr_man"), lambda: import_time("ipaddress"))
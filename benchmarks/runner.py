@@ -0,0 +1,203 @@
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from timeit import Timer
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+
+class Case(NamedTuple):
+    cidr_man: Callable[[], Any]
+    builtin: Optional[Callable[[], Any]] = None
+    size: int = 1
+    reset: Optional[Callable[[], Any]] = None
+
+
+class Result(NamedTuple):
+    name: str
+    unit: str
+    cidr_man: float
+    builtin: Optional[float]
+
+    @property
+    def ratio(self) -> Optional[float]:
+        if self.builtin is None or not self.cidr_man:
+            return None
+        return self.builtin / self.cidr_man
+
+
+_TIMINGS: List[Tuple[str, Callable[[], Case]]] = []
+_MEMORY: List[Tuple[str, Callable[[], Case]]] = []
+_MEASUREMENTS: List[Tuple[str, Callable[[], Case]]] = []
+
+
+def benchmark(name: str):
+    # The decorated function prepares the input data and returns a Case, the
+    # callables in the Case should process `size` items per call.
+    def decorator(setup: Callable[[], Case]):
+        _TIMINGS.append((name, setup))
+        return setup
+
+    return decorator
+
+
+def memory_benchmark(name: str):
+    # The callables in the Case should return a container holding `size`
+    # freshly created objects.
+    def decorator(setup: Callable[[], Case]):
+        _MEMORY.append((name, setup))
+        return setup
+
+    return decorator
+
+
+def measurement_benchmark(name: str):
+    # For costs that cannot be timed in process, the callables in the Case
+    # return a duration in seconds for `size` items which is taken as is.
+    def decorator(setup: Callable[[], Case]):
+        _MEASUREMENTS.append((name, setup))
+        return setup
+
+    return decorator
+
+
+def _time(func: Callable[[], Any], case: Case, repeat: int) -> float:
+    if case.reset is not None:
+        timer = Timer(func, setup=case.reset)
+        number = 1
+    else:
+        timer = Timer(func)
+        number, _ = timer.autorange()
+    return min(timer.repeat(repeat, number)) / (number * case.size)
+
+
+def _measure(func: Callable[[], float], case: Case, repeat: int) -> float:
+    return min(func() for _ in range(repeat)) / case.size
+
+
+def _memory(func: Callable[[], Any], case: Case) -> float:
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        objects = func()
+        after, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del objects
+    return (after - before) / case.size
+
+
+def run(
+    pattern: str = "", repeat: int = 5, report: Callable[[Result], Any] = None
+) -> List[Result]:
+    results = []
+    for name, setup in _TIMINGS:
+        if pattern not in name:
+            continue
+        case = setup()
+        builtin = None
+        if case.builtin is not None:
+            builtin = _time(case.builtin, case, repeat)
+        result = Result(name, "s", _time(case.cidr_man, case, repeat), builtin)
+        results.append(result)
+        if report is not None:
+            report(result)
+    for name, setup in _MEASUREMENTS:
+        if pattern not in name:
+            continue
+        case = setup()
+        builtin = None
+        if case.builtin is not None:
+            builtin = _measure(case.builtin, case, repeat)
+        result = Result(name, "s", _measure(case.cidr_man, case, repeat), builtin)
+        results.append(result)
+        if report is not None:
+            report(result)
+    for name, setup in _MEMORY:
+        if pattern not in name:
+            continue
+        case = setup()
+        builtin = None
+        if case.builtin is not None:
+            builtin = _memory(case.builtin, case)
+        result = Result(name, "B", _memory(case.cidr_man, case), builtin)
+        results.append(result)
+        if report is not None:
+            report(result)
+    return results
+
+
+def format_result(result: Result) -> str:
+    if result.unit == "s":
+        cidr_man = _format_seconds(result.cidr_man)
+        builtin = "" if result.builtin is None else _format_seconds(result.builtin)
+    else:
+        cidr_man = f"{result.cidr_man:10.1f} B "
+        builtin = "" if result.builtin is None else f"{result.builtin:10.1f} B "
+    ratio = "" if result.ratio is None else f"{result.ratio:8.3f}x"
+    return f"{result.name:<40} {cidr_man} {builtin:>13} {ratio:>9}"
+
+
+def _format_seconds(value: float) -> str:
+    if value >= 1e-3:
+        return f"{value * 1e3:10.1f} ms"
+    return f"{value * 1e9:10.1f} ns"
+
+
+def header() -> str:
+    return f"{'benchmark':<40} {'cidr_man':>13} {'builtin':>13} {'ratio':>9}"
+
+
+def metadata() -> Dict[str, Any]:
+    from cidr_man import cidr
+
+    try:
+        from importlib.metadata import version, PackageNotFoundError
+
+        try:
+            package_version = version("CIDR-Man")
+        except PackageNotFoundError:
+            package_version = "unknown"
+    except ImportError:
+        package_version = "unknown"
+    return {
+        "version": package_version,
+        "compiled": cidr.COMPILED,
+        "python": sys.version.split()[0],
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+    }
+
+
+def save(path: str, results: List[Result]):
+    data = {
+        "meta": metadata(),
+        "results": {
+            result.name: {
+                "unit": result.unit,
+                "cidr_man": result.cidr_man,
+                "builtin": result.builtin,
+                "ratio": result.ratio,
+            }
+            for result in results
+        },
+    }
+    with open(path, "w") as f:
+        json.dump(data, f, indent=2, sort_keys=True)
+
+
+def compare(path: str, results: List[Result]) -> List[Tuple[Result, float]]:
+    # Relative change of every cidr_man measurement against the run saved at
+    # path, positive values are slower (or larger) than before.
+    with open(path) as f:
+        previous = json.load(f)["results"]
+    changes = []
+    for result in results:
+        if result.name not in previous:
+            continue
+        before = previous[result.name]["cidr_man"]
+        if before:
+            changes.append((result, result.cidr_man / before - 1))
+    return changes
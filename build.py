@@ -0,0 +1,65 @@
+import os
+import sys
+import warnings
+
+from setuptools import Distribution, Extension
+from setuptools.command.build_ext import build_ext
+
+COMPILED_MODULES = ["cidr_man.cidr"]
+
+
+def _extensions():
+    if os.environ.get("CIDR_MAN_NO_EXTENSIONS"):
+        return []
+    if sys.implementation.name != "cpython":
+        return []
+    try:
+        from Cython.Build import cythonize
+    except ImportError:
+        warnings.warn("Cython is not installed, using the pure Python implementation")
+        return []
+    extensions = [
+        Extension(name, [name.replace(".", "/") + ".py"], optional=True)
+        for name in COMPILED_MODULES
+    ]
+    try:
+        return cythonize(
+            extensions,
+            compiler_directives={"language_level": 3, "annotation_typing": False},
+            quiet=True,
+        )
+    except Exception as e:
+        # Same as OptionalBuildExt, a module Cython cannot translate must not
+        # fail the install either.
+        warnings.warn(f"Failed to cythonize the compiled core: {e}")
+        return []
+
+
+class OptionalBuildExt(build_ext):
+    # A missing or broken compiler must never fail the install, the pure Python
+    # modules are always shipped alongside and are used whenever the
+    # compiled ones are absent.
+    def run(self):
+        try:
+            super().run()
+        except Exception as e:
+            warnings.warn(f"Failed to build the compiled core: {e}")
+
+
+def build(setup_kwargs):
+    setup_kwargs.update(
+        {"ext_modules": _extensions(), "cmdclass": {"build_ext": OptionalBuildExt}}
+    )
+
+
+if __name__ == "__main__":
+    distribution = Distribution(
+        {
+            "name": "cidr_man",
+            "ext_modules": _extensions(),
+            "cmdclass": {"build_ext": OptionalBuildExt},
+        }
+    )
+    command = distribution.get_command_obj("build_ext")
+    command.inplace = True
+    distribution.run_command("build_ext")
@@ -1 +1,5 @@
-from .cidr import CIDR, Version
+from .allocator import Allocator
+from .cidr import CIDR, Version, normalize_ipv4
+from .cidr import common_prefix_len, common_prefix_lens, common_supernet
+from .index import PrefixIndex, sorted_prefixes, sort_key
+from .diff import Change, ChangeType, diff_prefixes
@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from ipaddress import IPv4Address, IPv4Network, IPv6Address, IPv6Network
+from weakref import WeakKeyDictionary
+
+from .cidr import CIDR
+from .index import PrefixIndex
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from concurrent.futures import Executor, ProcessPoolExecutor
+    from typing import Any, AsyncIterable, AsyncIterator, Callable, List, Optional
+    from typing import Tuple
+
+    from .index import PAIR_T
+
+    RESULT_T = Tuple[Any, Optional[CIDR], Optional[PAIR_T]]
+
+_DONE = object()
+_BUILTIN = (IPv4Address, IPv4Network, IPv6Address, IPv6Network)
+# Executors made by process_executor, and the index their workers hold
+_SHIPPED = WeakKeyDictionary()
+# The index of a process_executor worker, set by its initializer
+_worker_index = None
+
+
+def enrich_batch(
+    index: PrefixIndex,
+    records: List[Any],
+    parse: Optional[Callable[[Any], Any]] = None,
+) -> List[RESULT_T]:
+    # Runs in the executor, so it must stay a picklable module level function
+    lookup = index.lookup
+    results = []
+    for record in records:
+        value = record
+        if parse is not None:
+            try:
+                value = parse(record)
+            except Exception:
+                # Whatever parse fails on, e.g. a blank line, is unparsable
+                value = None
+        try:
+            address = _parse(value)
+        except (ValueError, OSError):
+            address = None
+        if address is None:
+            results.append((record, None, None))
+        else:
+            results.append((record, address, lookup(address)))
+    return results
+
+
+def process_executor(
+    index: PrefixIndex, max_workers: Optional[int] = None
+) -> ProcessPoolExecutor:
+    # A process pool whose workers receive index once when they start, enrich
+    # then only sends the batches to them instead of pickling the whole index
+    # with every batch.
+    from concurrent.futures import ProcessPoolExecutor
+
+    executor = ProcessPoolExecutor(
+        max_workers, initializer=_install_index, initargs=(index,)
+    )
+    _SHIPPED[executor] = index
+    return executor
+
+
+async def enrich(
+    source: AsyncIterable[Any],
+    index: PrefixIndex,
+    *,
+    parse: Optional[Callable[[Any], Any]] = None,
+    batch_size: int = 1024,
+    max_pending: int = 4,
+    offload_threshold: int = 256,
+    executor: Optional[Executor] = None,
+) -> AsyncIterator[RESULT_T]:
+    # Yields (record, address, match) for every record of source, in order.
+    # address is None when the record could not be parsed, and match is the
+    # longest matching (prefix, value) of index or None.
+    #
+    # Records are read into batches of batch_size by a separate task, and
+    # batches of at least offload_threshold records are processed in
+    # executor (the loop's default executor when None). At most max_pending
+    # batches are buffered and max_pending more in flight, so a slow
+    # consumer stops the source from being read. Use process_executor for
+    # process offload, any other process pool is sent the index with every
+    # batch.
+    if batch_size < 1:
+        raise ValueError(f"batch_size must be at least 1, not {batch_size}")
+    if max_pending < 1:
+        # Queue(maxsize=0) is unbounded
+        raise ValueError(f"max_pending must be at least 1, not {max_pending}")
+    loop = asyncio.get_running_loop()
+    queue = asyncio.Queue(maxsize=max_pending)
+    producer = loop.create_task(_produce(source, queue, batch_size))
+    pending = deque()
+    shipped = executor is not None and _SHIPPED.get(executor) is index
+    try:
+        while True:
+            batch = await queue.get()
+            if batch is _DONE:
+                break
+            if len(batch) >= offload_threshold:
+                if shipped:
+                    work = loop.run_in_executor(executor, _enrich_shipped, batch, parse)
+                else:
+                    work = loop.run_in_executor(
+                        executor, enrich_batch, index, batch, parse
+                    )
+                pending.append(work)
+            else:
+                pending.append(enrich_batch(index, batch, parse))
+            if len(pending) >= max_pending:
+                for result in await _completed(pending.popleft()):
+                    yield result
+        while pending:
+            for result in await _completed(pending.popleft()):
+                yield result
+        # Re-raises any error from the source
+        await producer
+    finally:
+        producer.cancel()
+        for work in pending:
+            if isinstance(work, asyncio.Future):
+                work.cancel()
+
+
+def _parse(record: Any) -> Optional[CIDR]:
+    # None for anything that is neither text nor an address object
+    if isinstance(record, CIDR):
+        return record
+    if isinstance(record, (bytes, bytearray)):
+        record = record.decode()
+    if isinstance(record, str):
+        return CIDR(record.strip())
+    if isinstance(record, _BUILTIN):
+        return CIDR(record)
+    return None
+
+
+def _install_index(index: PrefixIndex):
+    global _worker_index
+    _worker_index = index
+
+
+def _enrich_shipped(
+    records: List[Any], parse: Optional[Callable[[Any], Any]]
+) -> List[RESULT_T]:
+    return enrich_batch(_worker_index, records, parse)
+
+
+async def _completed(work):
+    if isinstance(work, list):
+        return work
+    return await work
+
+
+async def _produce(source: AsyncIterable[Any], queue: asyncio.Queue, size: int):
+    try:
+        batch = []
+        async for record in source:
+            batch.append(record)
+            if len(batch) >= size:
+                await queue.put(batch)
+                batch = []
+        if batch:
+            await queue.put(batch)
+    except asyncio.CancelledError:
+        raise
+    except Exception:
+        # Wake the consumer, which re-raises by awaiting this task
+        await queue.put(_DONE)
+        raise
+    await queue.put(_DONE)
@@ -0,0 +1,196 @@
+from __future__ import annotations
+
+from heapq import heapify, heappop, heappush, merge
+
+from .cidr import CIDR, Version
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Dict, Iterator, List, Set
+
+    from .cidr import PREFIX_UNION_T
+
+
+class Allocator:
+    # Buddy allocator over a pool: the free blocks of every prefix length are
+    # kept in a set, allocating splits a free block into its left and right
+    # halves until the requested length is reached, and releasing merges a
+    # block with its free sibling for as long as there is one. Next to every
+    # set a min-heap finds the lowest free block, entries for blocks that
+    # left the set are skipped when popped. So every operation costs
+    # O(prefix length) set operations and at most one (amortised) O(log n)
+    # heap operation per level.
+    __pool: CIDR
+    __min_prefix: int
+    __max_prefix: int
+    __free: List[Set[int]]
+    __heaps: List[List[int]]
+    __allocated: Dict[int, int]
+
+    def __init__(self, pool: PREFIX_UNION_T):
+        if not isinstance(pool, CIDR):
+            pool = CIDR(pool)
+        self.__pool = pool
+        self.__min_prefix = pool.prefix_len
+        self.__max_prefix = pool.max_prefixlen
+        self.__free = [set() for _ in range(self.__max_prefix + 1)]
+        self.__heaps = [[] for _ in range(self.__max_prefix + 1)]
+        self.__add(self.__min_prefix, pool.ip)
+        self.__allocated = {}
+
+    @property
+    def pool(self) -> CIDR:
+        return self.__pool
+
+    def allocate(self, prefix_len: int) -> CIDR:
+        # Takes the lowest addressed block from the most specific free list
+        # that can hold a /prefix_len, so large blocks stay whole for as
+        # long as possible.
+        self.__check_prefix_len(prefix_len)
+        free = self.__free
+        length = prefix_len
+        while not free[length]:
+            if length == self.__min_prefix:
+                raise ValueError(f"no free /{prefix_len} in {self.__pool}")
+            length -= 1
+        ip = self.__pop_lowest(length)
+        self.__split(ip, length, prefix_len)
+        self.__allocated[ip] = prefix_len
+        return CIDR.from_normalized(ip, self.__pool.version, prefix_len)
+
+    def reserve(self, prefix: PREFIX_UNION_T) -> CIDR:
+        # Allocates exactly prefix, which must be free
+        if not isinstance(prefix, CIDR):
+            prefix = CIDR(prefix)
+        self.__check_prefix(prefix)
+        ip = prefix.ip
+        prefix_len = prefix.prefix_len
+        free = self.__free
+        for length in range(prefix_len, self.__min_prefix - 1, -1):
+            block = ip & ~((1 << (self.__max_prefix - length)) - 1)
+            if block in free[length]:
+                self.__remove(length, block)
+                self.__split_towards(block, length, ip, prefix_len)
+                self.__allocated[ip] = prefix_len
+                return prefix
+        raise ValueError(f"{prefix} is not free")
+
+    def release(self, prefix: PREFIX_UNION_T):
+        if not isinstance(prefix, CIDR):
+            prefix = CIDR(prefix)
+        self.__check_prefix(prefix)
+        ip = prefix.ip
+        length = prefix.prefix_len
+        if self.__allocated.get(ip) != length:
+            raise ValueError(f"{prefix} is not allocated")
+        del self.__allocated[ip]
+        free = self.__free
+        while length > self.__min_prefix:
+            buddy = ip ^ (1 << (self.__max_prefix - length))
+            if buddy not in free[length]:
+                break
+            self.__remove(length, buddy)
+            ip &= ~(1 << (self.__max_prefix - length))
+            length -= 1
+        self.__add(length, ip)
+
+    def free(self) -> List[CIDR]:
+        # Buddies are always merged, so these are the fewest CIDRs covering
+        # the free space.
+        version = self.__pool.version
+        blocks = merge(
+            *(
+                [(ip, length) for ip in sorted(self.__free[length])]
+                for length in range(self.__min_prefix, self.__max_prefix + 1)
+                if self.__free[length]
+            )
+        )
+        return [CIDR.from_normalized(ip, version, length) for ip, length in blocks]
+
+    def allocated(self) -> List[CIDR]:
+        version = self.__pool.version
+        return [
+            CIDR.from_normalized(ip, version, self.__allocated[ip])
+            for ip in sorted(self.__allocated)
+        ]
+
+    def __iter__(self) -> Iterator[CIDR]:
+        return iter(self.allocated())
+
+    def __len__(self) -> int:
+        return len(self.__allocated)
+
+    def to_bytes(self) -> bytes:
+        # The pool followed by every allocation as prefix length and packed
+        # address, the free space is rebuilt from these on restore.
+        size = self.__max_prefix // 8
+        pool = self.__pool
+        parts = [bytes((pool.version, pool.prefix_len)), pool.ip.to_bytes(size, "big")]
+        for ip in sorted(self.__allocated):
+            parts.append(bytes((self.__allocated[ip],)))
+            parts.append(ip.to_bytes(size, "big"))
+        return b"".join(parts)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "Allocator":
+        if len(data) < 2 or data[0] not in (Version.v4, Version.v6):
+            raise ValueError("invalid allocator state")
+        version = Version(data[0])
+        size = 4 if version == Version.v4 else 16
+        if (len(data) - 2) % (size + 1) != size:
+            raise ValueError("invalid allocator state")
+        ip = int.from_bytes(data[2 : 2 + size], "big")
+        allocator = cls(CIDR(ip, version, data[1]))
+        for offset in range(2 + size, len(data), size + 1):
+            ip = int.from_bytes(data[offset + 1 : offset + 1 + size], "big")
+            allocator.reserve(CIDR(ip, version, data[offset]))
+        return allocator
+
+    def __add(self, length: int, ip: int):
+        self.__free[length].add(ip)
+        heappush(self.__heaps[length], ip)
+
+    def __remove(self, length: int, ip: int):
+        blocks = self.__free[length]
+        blocks.remove(ip)
+        heap = self.__heaps[length]
+        # Rebuild once most heap entries are stale, so the heap stays within
+        # a constant factor of the free blocks.
+        if len(heap) > 2 * len(blocks) + 16:
+            heap[:] = blocks
+            heapify(heap)
+
+    def __pop_lowest(self, length: int) -> int:
+        blocks = self.__free[length]
+        heap = self.__heaps[length]
+        while True:
+            ip = heappop(heap)
+            if ip in blocks:
+                blocks.remove(ip)
+                return ip
+
+    def __split(self, ip: int, length: int, prefix_len: int):
+        # Frees the right half of every block on the way down to prefix_len
+        for level in range(length + 1, prefix_len + 1):
+            self.__add(level, ip | (1 << (self.__max_prefix - level)))
+
+    def __split_towards(self, block: int, length: int, ip: int, prefix_len: int):
+        # Same as __split, but follows ip down and frees whichever half it
+        # is not in.
+        for level in range(length + 1, prefix_len + 1):
+            bit = 1 << (self.__max_prefix - level)
+            if ip & bit:
+                self.__add(level, block)
+                block |= bit
+            else:
+                self.__add(level, block | bit)
+
+    def __check_prefix_len(self, prefix_len: int):
+        if not self.__min_prefix <= prefix_len <= self.__max_prefix:
+            raise ValueError(f"prefix length {prefix_len} does not fit {self.__pool}")
+
+    def __check_prefix(self, prefix: CIDR):
+        if prefix.version != self.__pool.version:
+            raise ValueError("ip version mismatch")
+        if prefix not in self.__pool:
+            raise ValueError(f"{prefix} is not in {self.__pool}")
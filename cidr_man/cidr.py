@@ -1,21 +1,44 @@
-from copy import deepcopy
 from enum import IntEnum
 from functools import lru_cache
-from ipaddress import (
-    IPv4Network,
-    IPv6Network,
-    IPv4Address,
-    IPv6Address,
-    _BaseNetwork,
-    ip_network,
-    ip_address,
-)
-from socket import inet_pton, AF_INET, AF_INET6, inet_ntop
-from typing import Union, Tuple, Optional
 
-PREFIX_UNION_T = Union[
-    str, int, bytes, "CIDR", IPv4Network, IPv6Network, IPv4Address, IPv6Address
-]
+try:
+    # The C module behind socket, which skips socket's own imports
+    from _socket import inet_pton, AF_INET, AF_INET6, inet_ntop
+except ImportError:
+    from socket import inet_pton, AF_INET, AF_INET6, inet_ntop
+
+# typing and ipaddress are only imported where they are actually needed
+# (type checking, and converting to and from the built-in types) so that
+# importing this module stays cheap. Annotations naming them are strings so
+# they are never evaluated (from __future__ import annotations is not
+# supported by Cython 0.29).
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from ipaddress import IPv4Network, IPv6Network, IPv4Address, IPv6Address
+    from typing import Union, Tuple, Optional, Iterable, List
+
+    BUFFER_T = Union[bytes, bytearray, memoryview]
+    PREFIX_UNION_T = Union[
+        str,
+        int,
+        BUFFER_T,
+        "CIDR",
+        IPv4Network,
+        IPv6Network,
+        IPv4Address,
+        IPv6Address,
+    ]
+
+# The compiled core is loaded from an extension module instead of this file
+COMPILED = not __file__.endswith((".py", ".pyc"))
+
+_IPV4_MAPPED_HIGH = 0xFFFF
+_IPV4_MAPPED = _IPV4_MAPPED_HIGH << 32
+_SIXTOFOUR_HIGH = 0x2002
+_SIXTOFOUR = _SIXTOFOUR_HIGH << 112
+_TEREDO_HIGH = 0x20010000
+_NAT64_WELL_KNOWN = 0x64FF9B << 96
+_NAT64_PREFIX_LENS = (32, 40, 48, 56, 64, 96)
 
 
 class Version(IntEnum):
@@ -23,25 +46,29 @@ class Version(IntEnum):
     v6 = 6
 
 
+# Looking a member up on the enum class is several times slower than a global
+_VERSION_V4 = Version.v4
+
+
 class CIDR:
     __prefix_len: int
     __max_prefix: int
     __ip: int
-    __ip_str: str
-    __packed: bytes
+    __ip_str: str = None
+    __packed: bytes = None
     __version: Version
-    _is_global: bool
-    _is_link_local: bool
-    _is_loopback: bool
-    _is_multicast: bool
-    _is_private: bool
-    _is_reserved: bool
+    _is_global: bool = None
+    _is_link_local: bool = None
+    _is_loopback: bool = None
+    _is_multicast: bool = None
+    _is_private: bool = None
+    _is_reserved: bool = None
 
     def __init__(
         self,
-        net: Optional[PREFIX_UNION_T] = None,
-        version: Optional[Version] = None,
-        prefix_len: Optional[int] = -1,
+        net: "Optional[PREFIX_UNION_T]" = None,
+        version: "Optional[Version]" = None,
+        prefix_len: "Optional[int]" = -1,
     ):
         _version = Version.v4
         _prefix_len = -1
@@ -52,12 +79,16 @@ class CIDR:
                 discovered = True
             elif isinstance(net, int):
                 self.__ip = net
-            elif isinstance(net, bytes):
-                _version, self.__ip = _convert_bytes(net)
-                _prefix_len = max_prefix(_version)
+            elif isinstance(net, (bytes, bytearray, memoryview)):
+                _version, self.__ip, _prefix_len = _convert_bytes(net)
                 discovered = True
             else:
-                _version, self.__ip, _prefix_len = _convert_builtin(net)
+                try:
+                    _version, self.__ip, _prefix_len = _convert_builtin(net)
+                except (TypeError, AttributeError):
+                    # Any other object supporting the buffer protocol, such
+                    # as an array, is a packed address as well
+                    _version, self.__ip, _prefix_len = _convert_bytes(memoryview(net))
                 discovered = True
             if version is None:
                 self.__version = _version
@@ -75,14 +106,65 @@ class CIDR:
             self.__ip = 0
         self.__ip = _strip_host_bits(self.__ip, self.__prefix_len, self.__version)
         self.__max_prefix = max_prefix(self.__version)
-        self.__packed = None
-        self.__ip_str = None
-        self._is_global = None
-        self._is_link_local = None
-        self._is_loopback = None
-        self._is_multicast = None
-        self._is_private = None
-        self._is_reserved = None
+
+    @classmethod
+    def from_normalized(cls, ip: int, version: Version, prefix_len: int) -> "CIDR":
+        # Skips input dispatch and host bit stripping, the caller guarantees
+        # that ip is already a network address for prefix_len. The cached
+        # fields fall back to their class level defaults until first use.
+        if version.__class__ is not Version:
+            version = Version(version)
+        self = cls.__new__(cls)
+        self.__ip = ip
+        self.__version = version
+        self.__prefix_len = prefix_len
+        self.__max_prefix = 32 if version == 4 else 128
+        return self
+
+    @classmethod
+    def from_buffer(
+        cls,
+        buf: "BUFFER_T",
+        version: Version,
+        count: int = 1,
+        stride: int = 0,
+        offset: int = 0,
+    ) -> "List[CIDR]":
+        # Decodes count packed addresses, the first at offset and each next
+        # one stride bytes further (e.g. a field of fixed size records),
+        # straight from buf without slicing it.
+        from struct import Struct
+
+        version = Version(version)
+        if version == Version.v4:
+            size = 4
+            unpack = Struct(">I").unpack_from
+        else:
+            size = 16
+            unpack = Struct(">QQ").unpack_from
+        stride = stride or size
+        if count < 0 or offset < 0 or stride < size:
+            raise ValueError("invalid count, stride or offset")
+        # len() counts items, which are not bytes for e.g. an array('I')
+        length = memoryview(buf).nbytes
+        if count and offset + (count - 1) * stride + size > length:
+            raise ValueError("buffer too small")
+        new = cls.__new__
+        max_prefix = 32 if version == Version.v4 else 128
+        result = []
+        for position in range(offset, offset + count * stride, stride):
+            if size == 4:
+                (ip,) = unpack(buf, position)
+            else:
+                high, low = unpack(buf, position)
+                ip = (high << 64) | low
+            self = new(cls)
+            self.__ip = ip
+            self.__version = version
+            self.__prefix_len = max_prefix
+            self.__max_prefix = max_prefix
+            result.append(self)
+        return result
 
     @property
     def ip(self):
@@ -111,7 +193,7 @@ class CIDR:
     @property
     def network_address(self) -> "CIDR":
         if self.__prefix_len != self.__max_prefix:
-            return self.__class__(self.__ip, self.__version)
+            return self.from_normalized(self.__ip, self.__version, self.__max_prefix)
         return self.copy()
 
     @property
@@ -119,7 +201,9 @@ class CIDR:
         if self.__prefix_len != self.__max_prefix:
             prefix_len = self.__prefix_len
             mask = 1 << (self.__max_prefix - prefix_len)
-            return self.__class__(self.__ip ^ (mask - 1), self.__version)
+            return self.from_normalized(
+                self.__ip ^ (mask - 1), self.__version, self.__max_prefix
+            )
 
     @property
     def netmask(self) -> "CIDR":
@@ -162,26 +246,60 @@ class CIDR:
         return self.__packed
 
     def supernet(self) -> "CIDR":
+        if self.__prefix_len == 0:
+            raise ValueError(f"{self} has no supernet")
         prefix_len = self.__prefix_len - 1
-        return self.__class__(self.__ip, self.__version, prefix_len)
+        shift = self.__max_prefix - prefix_len
+        ip = (self.__ip >> shift) << shift
+        return self.from_normalized(ip, self.__version, prefix_len)
 
-    def subnets(self) -> Tuple["CIDR", "CIDR"]:
+    def subnets(self) -> "Tuple[CIDR, CIDR]":
         return self.left, self.right
 
     @property
     def left(self) -> "CIDR":
+        if self.__prefix_len == self.__max_prefix:
+            raise ValueError(f"{self} has no subnets")
         prefix_len = self.__prefix_len + 1
-        return self.__class__(self.__ip, self.__version, prefix_len)
+        return self.from_normalized(self.__ip, self.__version, prefix_len)
 
     @property
     def right(self) -> "CIDR":
+        if self.__prefix_len == self.__max_prefix:
+            raise ValueError(f"{self} has no subnets")
         prefix_len = self.__prefix_len + 1
         mask = 1 << (self.__max_prefix - prefix_len)
-        return self.__class__(self.__ip ^ mask, self.__version, prefix_len)
+        return self.from_normalized(self.__ip ^ mask, self.__version, prefix_len)
+
+    @property
+    def sibling(self) -> "CIDR":
+        if self.__prefix_len == 0:
+            raise ValueError(f"{self} has no sibling")
+        mask = 1 << (self.__max_prefix - self.__prefix_len)
+        return self.from_normalized(self.__ip ^ mask, self.__version, self.__prefix_len)
+
+    def ancestor(self, prefix_len: int) -> "CIDR":
+        if not 0 <= prefix_len <= self.__prefix_len:
+            raise ValueError(f"invalid prefix_len {prefix_len} for ancestor of {self}")
+        shift = self.__max_prefix - prefix_len
+        ip = (self.__ip >> shift) << shift
+        return self.from_normalized(ip, self.__version, prefix_len)
+
+    def next_prefix(self) -> "CIDR":
+        ip = self.__ip + (1 << (self.__max_prefix - self.__prefix_len))
+        if ip >> self.__max_prefix:
+            raise ValueError(f"{self} is the last prefix of its size")
+        return self.from_normalized(ip, self.__version, self.__prefix_len)
+
+    def prev_prefix(self) -> "CIDR":
+        ip = self.__ip - (1 << (self.__max_prefix - self.__prefix_len))
+        if ip < 0:
+            raise ValueError(f"{self} is the first prefix of its size")
+        return self.from_normalized(ip, self.__version, self.__prefix_len)
 
     def subnet_of(
         self,
-        other: PREFIX_UNION_T,
+        other: "PREFIX_UNION_T",
     ):
         if not isinstance(other, self.__class__):
             other = self.__class__(other)
@@ -189,7 +307,7 @@ class CIDR:
 
     def contains(
         self,
-        subnet: PREFIX_UNION_T,
+        subnet: "PREFIX_UNION_T",
     ) -> bool:
         if not isinstance(subnet, self.__class__):
             subnet = self.__class__(subnet)
@@ -204,15 +322,15 @@ class CIDR:
     def is_global(self):
         if self._is_global is not None:
             return self._is_global
-        for net in RESERVED:
+        for net in _special_purpose("RESERVED"):
             if net.version == self.__version and net.contains(self):
                 self._is_global = False
                 return False
-        for net in PRIVATE:
+        for net in _special_purpose("PRIVATE"):
             if net.version == self.__version and net.contains(self):
                 self._is_global = False
                 return False
-        for net in OTHER:
+        for net in _special_purpose("OTHER"):
             if net.version == self.__version and net.contains(self):
                 self._is_global = False
                 return False
@@ -223,7 +341,7 @@ class CIDR:
     def is_private(self):
         if self._is_private is not None:
             return self._is_private
-        for net in PRIVATE:
+        for net in _special_purpose("PRIVATE"):
             if net.version == self.__version and net.contains(self):
                 self._is_private = True
                 return True
@@ -234,7 +352,7 @@ class CIDR:
     def is_reserved(self):
         if self._is_reserved is not None:
             return self._is_reserved
-        for net in RESERVED:
+        for net in _special_purpose("RESERVED"):
             if net.version == self.__version and net.contains(self):
                 self._is_reserved = True
                 return True
@@ -245,7 +363,7 @@ class CIDR:
     def is_link_local(self):
         if self._is_link_local is not None:
             return self._is_link_local
-        for net in LINK_LOCAL:
+        for net in _special_purpose("LINK_LOCAL"):
             if net.version == self.__version and net.contains(self):
                 self._is_link_local = True
                 return True
@@ -256,7 +374,7 @@ class CIDR:
     def is_loopback(self):
         if self._is_loopback is not None:
             return self._is_loopback
-        for net in LOOPBACK:
+        for net in _special_purpose("LOOPBACK"):
             if net.version == self.__version and net.contains(self):
                 self._is_loopback = True
                 return True
@@ -267,7 +385,7 @@ class CIDR:
     def is_multicast(self):
         if self._is_multicast is not None:
             return self._is_multicast
-        for net in MULTICAST:
+        for net in _special_purpose("MULTICAST"):
             if net.version == self.__version and net.contains(self):
                 self._is_multicast = True
                 return True
@@ -293,18 +411,115 @@ class CIDR:
                 reverse_nibbles = reverse_nibbles[n:]
         return f"{'.'.join(reverse_nibbles)}.ip6.arpa"
 
+    @property
+    def ipv4_mapped(self) -> "Optional[CIDR]":
+        # The result is built in place rather than through from_normalized,
+        # the call and its version check are most of the cost of this property.
+        ip = self.__ip
+        prefix_len = self.__prefix_len
+        if self.__max_prefix != 128 or prefix_len < 96 or ip >> 32 != _IPV4_MAPPED_HIGH:
+            return None
+        cls = self.__class__
+        v4 = cls.__new__(cls)
+        v4.__ip = ip & 0xFFFFFFFF
+        v4.__version = _VERSION_V4
+        v4.__prefix_len = prefix_len - 96
+        v4.__max_prefix = 32
+        return v4
+
+    @property
+    def sixtofour(self) -> "Optional[CIDR]":
+        # Built in place, same as ipv4_mapped
+        ip = self.__ip
+        prefix_len = self.__prefix_len
+        if self.__max_prefix != 128 or prefix_len < 16 or ip >> 112 != _SIXTOFOUR_HIGH:
+            return None
+        cls = self.__class__
+        v4 = cls.__new__(cls)
+        v4.__ip = (ip >> 80) & 0xFFFFFFFF
+        v4.__version = _VERSION_V4
+        v4.__prefix_len = prefix_len - 16 if prefix_len < 48 else 32
+        v4.__max_prefix = 32
+        return v4
+
+    @property
+    def teredo(self) -> "Optional[Tuple[CIDR, CIDR]]":
+        # Only full addresses carry a server and client
+        if self.__max_prefix != 128 or self.__prefix_len != 128:
+            return None
+        if self.__ip >> 96 != _TEREDO_HIGH:
+            return None
+        server = (self.__ip >> 64) & 0xFFFFFFFF
+        client = ~self.__ip & 0xFFFFFFFF
+        return (
+            self.__class__.from_normalized(server, Version.v4, 32),
+            self.__class__.from_normalized(client, Version.v4, 32),
+        )
+
+    def nat64(self, prefix: "Optional[PREFIX_UNION_T]" = None) -> "Optional[CIDR]":
+        nat64_ip, nat64_len = _nat64_prefix(prefix)
+        if self.__max_prefix != 128 or self.__prefix_len < nat64_len:
+            return None
+        shift = 128 - nat64_len
+        if self.__ip >> shift != nat64_ip >> shift:
+            return None
+        ip, prefix_len = _nat64_extract(self.__ip, self.__prefix_len, nat64_len)
+        return self.__class__.from_normalized(ip, Version.v4, prefix_len)
+
+    def to_ipv4_mapped(self) -> "CIDR":
+        if self.__max_prefix != 32:
+            raise ValueError("ip version mismatch")
+        return self.__class__.from_normalized(
+            _IPV4_MAPPED | self.__ip, Version.v6, self.__prefix_len + 96
+        )
+
+    def to_sixtofour(self) -> "CIDR":
+        if self.__max_prefix != 32:
+            raise ValueError("ip version mismatch")
+        return self.__class__.from_normalized(
+            _SIXTOFOUR | (self.__ip << 80), Version.v6, self.__prefix_len + 16
+        )
+
+    def to_nat64(self, prefix: "Optional[PREFIX_UNION_T]" = None) -> "CIDR":
+        if self.__max_prefix != 32:
+            raise ValueError("ip version mismatch")
+        nat64_ip, nat64_len = _nat64_prefix(prefix)
+        ip, prefix_len = _nat64_embed(self.__ip, self.__prefix_len, nat64_ip, nat64_len)
+        return self.__class__.from_normalized(ip, Version.v6, prefix_len)
+
     def copy(self) -> "CIDR":
-        return deepcopy(self)
+        copy = self.__class__.__new__(self.__class__)
+        copy.__dict__.update(self.__dict__)
+        return copy
 
     def __contains__(
         self,
-        subnet: PREFIX_UNION_T,
+        subnet: "PREFIX_UNION_T",
     ) -> bool:
         return self.contains(subnet)
 
     def __int__(self):
         return self.__ip
 
+    def __add__(self, other: int) -> "CIDR":
+        if not isinstance(other, int):
+            return NotImplemented
+        ip = self.__ip + other
+        if ip < 0 or ip >> self.__max_prefix:
+            raise ValueError(f"{self} + {other} is out of range")
+        return self.from_normalized(ip, self.__version, self.__max_prefix)
+
+    __radd__ = __add__
+
+    def __sub__(self, other: "Union[int, CIDR]") -> "Union[CIDR, int]":
+        if isinstance(other, int):
+            return self.__add__(-other)
+        if isinstance(other, self.__class__):
+            if self.__version != other.version:
+                raise ValueError("ip version mismatch")
+            return self.__ip - other.ip
+        return NotImplemented
+
     def __str__(self):
         return self.compressed
 
@@ -316,7 +531,7 @@ class CIDR:
 
     def __lt__(
         self,
-        other: PREFIX_UNION_T,
+        other: "PREFIX_UNION_T",
     ):
         if self.__version != other.version:
             raise ValueError("ip version mismatch")
@@ -324,7 +539,7 @@ class CIDR:
 
     def __lte__(
         self,
-        other: PREFIX_UNION_T,
+        other: "PREFIX_UNION_T",
     ):
         if self.__version != other.version:
             raise ValueError("ip version mismatch")
@@ -332,9 +547,7 @@ class CIDR:
 
     def __eq__(
         self,
-        subnet: Union[
-            "CIDR", str, int, IPv4Network, IPv6Network, IPv4Address, IPv6Address
-        ],
+        subnet: "Union[CIDR, str, int, IPv4Network, IPv6Network, IPv4Address, IPv6Address]",
     ):
         if not isinstance(subnet, self.__class__):
             subnet = self.__class__(subnet)
@@ -344,7 +557,7 @@ class CIDR:
 
     def __gt__(
         self,
-        other: PREFIX_UNION_T,
+        other: "PREFIX_UNION_T",
     ):
         if self.__version != other.version:
             raise ValueError("ip version mismatch")
@@ -352,7 +565,7 @@ class CIDR:
 
     def __gte__(
         self,
-        other: PREFIX_UNION_T,
+        other: "PREFIX_UNION_T",
     ):
         if self.__version != other.version:
             raise ValueError("ip version mismatch")
@@ -362,6 +575,8 @@ class CIDR:
         return (self.__ip, self.__prefix_len).__hash__()
 
     def __format__(self, fmt):
+        from ipaddress import ip_address, ip_network
+
         if self.__prefix_len == self.__max_prefix:
             network = ip_address(self.compressed)
         else:
@@ -391,7 +606,7 @@ def _byte_length(version: Version):
 
 
 @lru_cache(None)
-def _convert_str(net: str) -> Tuple[Version, int, int]:
+def _convert_str(net: str) -> "Tuple[Version, int, int]":
     parts = net.split("/")
     ip: bytes
     if len(parts) == 2:
@@ -413,8 +628,10 @@ def _convert_str(net: str) -> Tuple[Version, int, int]:
 
 @lru_cache(None)
 def _convert_builtin(
-    net: Union[IPv4Network, IPv6Network, IPv4Address, IPv6Address]
-) -> Tuple[Version, int, int]:
+    net: "Union[IPv4Network, IPv6Network, IPv4Address, IPv6Address]",
+) -> "Tuple[Version, int, int]":
+    from ipaddress import _BaseNetwork
+
     version = Version(net.version)
     if isinstance(net, _BaseNetwork):
         ip = int(net.network_address)
@@ -425,13 +642,15 @@ def _convert_builtin(
     return version, ip, prefix
 
 
-@lru_cache(None)
-def _convert_bytes(net: bytes) -> Tuple[Version, int]:
-    if len(net) == 4:
-        version = Version.v4
-    else:
-        version = Version.v6
-    return version, int.from_bytes(net, "big", signed=False)
+def _convert_bytes(net: "BUFFER_T") -> "Tuple[Version, int, int]":
+    # Not cached, decoding is cheaper than hashing the key and every packet
+    # would add an entry. memoryviews are decoded in place without a copy.
+    size = net.nbytes if isinstance(net, memoryview) else len(net)
+    if size == 4:
+        return Version.v4, int.from_bytes(net, "big"), 32
+    if size == 16:
+        return Version.v6, int.from_bytes(net, "big"), 128
+    raise ValueError(f"packed address must be 4 or 16 bytes, not {size}")
 
 
 def _strip_host_bits(ip: int, prefix_len: int, version: Version):
@@ -439,31 +658,198 @@ def _strip_host_bits(ip: int, prefix_len: int, version: Version):
     return (ip >> shift) << shift
 
 
-LINK_LOCAL = [CIDR("169.254.0.0/16"), CIDR("fe80::/10")]
-LOOPBACK = [CIDR("127.0.0.0/8"), CIDR("::1/128")]
-CARRIER = [CIDR("192.0.0.0/29"), CIDR("100.64.0.0/10"), CIDR("2002::/16")]
-DOCUMENTATION = [
-    CIDR("192.0.2.0/24"),
-    CIDR("198.51.100.0/24"),
-    CIDR("203.0.113.0/24"),
-    CIDR("2001:db8::/32"),
-    CIDR("233.252.0.0/24"),
-]
-PRIVATE = [
-    CIDR("10.0.0.0/8"),
-    CIDR("172.16.0.0/12"),
-    CIDR("192.168.0.0/16"),
-    CIDR("198.18.0.0/15"),
-    CIDR("2001::/32"),
-    CIDR("fc00::/7"),
-    CIDR("64:ff9b:1::/48"),
-    CIDR("2001:2::/48"),
-    CIDR("100::/64"),
-    *CARRIER,
-    *LINK_LOCAL,
-    *LOOPBACK,
-    *DOCUMENTATION,
-]
-RESERVED = [CIDR("240.0.0.0/4"), CIDR("::ffff:0:0/96"), *LOOPBACK]
-MULTICAST = [CIDR("224.0.0.0/4"), CIDR("233.252.0.0/24"), CIDR("ff00::/8")]
-OTHER = [CIDR("192.0.0.0/24"), CIDR("2001::/23"), CIDR("2001:10::/28")]
+def normalize_ipv4(
+    nets: "Iterable[PREFIX_UNION_T]", nat64_prefix: "Optional[PREFIX_UNION_T]" = None
+) -> "List[CIDR]":
+    nat64_ip, nat64_len = _nat64_prefix(nat64_prefix)
+    nat64_shift = 128 - nat64_len
+    nat64_high = nat64_ip >> nat64_shift
+    result = []
+    for net in nets:
+        if not isinstance(net, CIDR):
+            net = CIDR(net)
+        if net.version == Version.v6:
+            ip = net.ip
+            prefix_len = net.prefix_len
+            if ip >> 32 == _IPV4_MAPPED_HIGH and prefix_len >= 96:
+                net = CIDR.from_normalized(ip & 0xFFFFFFFF, Version.v4, prefix_len - 96)
+            elif ip >> nat64_shift == nat64_high and prefix_len >= nat64_len:
+                ip, prefix_len = _nat64_extract(ip, prefix_len, nat64_len)
+                net = CIDR.from_normalized(ip, Version.v4, prefix_len)
+            elif ip >> 112 == _SIXTOFOUR_HIGH and prefix_len >= 16:
+                ip = (ip >> 80) & 0xFFFFFFFF
+                net = CIDR.from_normalized(ip, Version.v4, min(prefix_len - 16, 32))
+        result.append(net)
+    return result
+
+
+def common_prefix_len(a: "PREFIX_UNION_T", b: "PREFIX_UNION_T") -> int:
+    if not isinstance(a, CIDR):
+        a = CIDR(a)
+    if not isinstance(b, CIDR):
+        b = CIDR(b)
+    if a.version != b.version:
+        raise ValueError("ip version mismatch")
+    common = a.max_prefixlen - (a.ip ^ b.ip).bit_length()
+    return min(common, a.prefix_len, b.prefix_len)
+
+
+def common_supernet(*nets: "PREFIX_UNION_T") -> CIDR:
+    # The bits shared by every network are the bits shared by the lowest and
+    # highest address, so this needs no supernet() walk.
+    if not nets:
+        raise ValueError("common_supernet() needs at least one network")
+    low = high = None
+    prefix_len = 128
+    version = None
+    for net in nets:
+        if not isinstance(net, CIDR):
+            net = CIDR(net)
+        ip = net.ip
+        if version is None:
+            version = net.version
+            low = high = ip
+        elif net.version != version:
+            raise ValueError("ip version mismatch")
+        elif ip < low:
+            low = ip
+        elif ip > high:
+            high = ip
+        if net.prefix_len < prefix_len:
+            prefix_len = net.prefix_len
+    bits = max_prefix(version)
+    prefix_len = min(prefix_len, bits - (low ^ high).bit_length())
+    return CIDR.from_normalized(
+        low & ~((1 << (bits - prefix_len)) - 1), version, prefix_len
+    )
+
+
+def common_prefix_lens(nets: "Iterable[PREFIX_UNION_T]") -> "List[int]":
+    # common_prefix_len of every adjacent pair, which on sorted input is how
+    # far apart neighbours are in the tree. Pairs of different versions give
+    # -1.
+    result = []
+    last_ip = last_len = last_version = None
+    for net in nets:
+        if not isinstance(net, CIDR):
+            net = CIDR(net)
+        ip = net.ip
+        prefix_len = net.prefix_len
+        version = net.version
+        if last_version is not None:
+            if version != last_version:
+                result.append(-1)
+            else:
+                common = net.max_prefixlen - (ip ^ last_ip).bit_length()
+                result.append(min(common, prefix_len, last_len))
+        last_ip = ip
+        last_len = prefix_len
+        last_version = version
+    return result
+
+
+def _nat64_prefix(prefix: "Optional[PREFIX_UNION_T]") -> "Tuple[int, int]":
+    if prefix is None:
+        return _NAT64_WELL_KNOWN, 96
+    if not isinstance(prefix, CIDR):
+        prefix = CIDR(prefix)
+    if prefix.version != Version.v6 or prefix.prefix_len not in _NAT64_PREFIX_LENS:
+        raise ValueError(f"invalid NAT64 prefix {prefix}")
+    return prefix.ip, prefix.prefix_len
+
+
+def _nat64_embed(
+    ip: int, prefix_len: int, nat64_ip: int, nat64_len: int
+) -> "Tuple[int, int]":
+    # RFC 6052 section 2.2: bits 64 to 71 (the "u" octet) are always zero, so
+    # for prefixes shorter than /96 the IPv4 address is split around them.
+    if nat64_len == 96:
+        return nat64_ip | ip, 96 + prefix_len
+    head = 64 - nat64_len
+    tail = 32 - head
+    embedded = (
+        nat64_ip | ((ip >> tail) << 64) | ((ip & ((1 << tail) - 1)) << (56 - tail))
+    )
+    if prefix_len == 32:
+        return embedded, 128
+    if prefix_len > head:
+        prefix_len += 8
+    return embedded, nat64_len + prefix_len
+
+
+def _nat64_extract(ip: int, prefix_len: int, nat64_len: int) -> "Tuple[int, int]":
+    prefix_len -= nat64_len
+    if nat64_len == 96:
+        return ip & 0xFFFFFFFF, prefix_len
+    head = 64 - nat64_len
+    tail = 32 - head
+    embedded = (((ip >> 64) & ((1 << head) - 1)) << tail) | (
+        (ip >> (56 - tail)) & ((1 << tail) - 1)
+    )
+    if prefix_len > head:
+        prefix_len = max(head, prefix_len - 8)
+    return embedded, min(prefix_len, 32)
+
+
+def __getattr__(name: str):
+    # The special purpose tables are only built when first used
+    if name in _SPECIAL_PURPOSE:
+        return _special_purpose(name)
+    if name == "PREFIX_UNION_T":
+        from ipaddress import IPv4Network, IPv6Network, IPv4Address, IPv6Address
+        from typing import Union
+
+        return Union[
+            str,
+            int,
+            bytes,
+            bytearray,
+            memoryview,
+            CIDR,
+            IPv4Network,
+            IPv6Network,
+            IPv4Address,
+            IPv6Address,
+        ]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+@lru_cache(None)
+def _special_purpose(name: str) -> "List[CIDR]":
+    return [CIDR(net) for net in _SPECIAL_PURPOSE[name]]
+
+
+_LINK_LOCAL = ("169.254.0.0/16", "fe80::/10")
+_LOOPBACK = ("127.0.0.0/8", "::1/128")
+_CARRIER = ("192.0.0.0/29", "100.64.0.0/10", "2002::/16")
+_DOCUMENTATION = (
+    "192.0.2.0/24",
+    "198.51.100.0/24",
+    "203.0.113.0/24",
+    "2001:db8::/32",
+    "233.252.0.0/24",
+)
+_SPECIAL_PURPOSE = {
+    "LINK_LOCAL": _LINK_LOCAL,
+    "LOOPBACK": _LOOPBACK,
+    "CARRIER": _CARRIER,
+    "DOCUMENTATION": _DOCUMENTATION,
+    "PRIVATE": (
+        "10.0.0.0/8",
+        "172.16.0.0/12",
+        "192.168.0.0/16",
+        "198.18.0.0/15",
+        "2001::/32",
+        "fc00::/7",
+        "64:ff9b:1::/48",
+        "2001:2::/48",
+        "100::/64",
+        *_CARRIER,
+        *_LINK_LOCAL,
+        *_LOOPBACK,
+        *_DOCUMENTATION,
+    ),
+    "RESERVED": ("240.0.0.0/4", "::ffff:0:0/96", *_LOOPBACK),
+    "MULTICAST": ("224.0.0.0/4", "233.252.0.0/24", "ff00::/8"),
+    "OTHER": ("192.0.0.0/24", "2001::/23", "2001:10::/28"),
+}
@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+from collections import namedtuple
+from enum import IntEnum
+
+from .cidr import CIDR
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, Iterable, Iterator, List, Optional, Tuple
+
+    from .cidr import PREFIX_UNION_T
+
+    ENTRY_T = Tuple[int, int, int, CIDR]
+
+
+class ChangeType(IntEnum):
+    ADDED = 1
+    WITHDRAWN = 2
+    MORE_SPECIFIC = 3
+    LESS_SPECIFIC = 4
+
+
+# related is the prefix of the other snapshot that explains the change: the
+# most specific old prefix covering a MORE_SPECIFIC one, the first old prefix
+# covered by a LESS_SPECIFIC one, and the most specific new prefix still
+# covering a WITHDRAWN one (None when nothing does).
+Change = namedtuple("Change", ("type", "prefix", "related"))
+
+
+def diff_prefixes(
+    old: Iterable[PREFIX_UNION_T], new: Iterable[PREFIX_UNION_T]
+) -> Iterator[Change]:
+    # Streams the changes between two sorted snapshots (as produced by
+    # sorted_prefixes or sorted by sort_key) in a single merge pass. Each
+    # side keeps a stack of the prefixes covering the current position, and
+    # the next entry of the old side tells whether a new prefix is an
+    # aggregate of existing ones, so no lookups are needed.
+    old_entries = _entries(old)
+    new_entries = _entries(new)
+    old_entry = next(old_entries, None)
+    new_entry = next(new_entries, None)
+    old_stack = []
+    new_stack = []
+    while old_entry is not None or new_entry is not None:
+        if new_entry is None or (old_entry is not None and old_entry[0] < new_entry[0]):
+            _, start, end, prefix = old_entry
+            yield Change(ChangeType.WITHDRAWN, prefix, _covering(new_stack, start))
+            _push(old_stack, start, end, prefix)
+            old_entry = next(old_entries, None)
+        elif old_entry is None or new_entry[0] < old_entry[0]:
+            _, start, end, prefix = new_entry
+            covering = _covering(old_stack, start)
+            if covering is not None:
+                yield Change(ChangeType.MORE_SPECIFIC, prefix, covering)
+            elif old_entry is not None and old_entry[1] <= end:
+                yield Change(ChangeType.LESS_SPECIFIC, prefix, old_entry[3])
+            else:
+                yield Change(ChangeType.ADDED, prefix, None)
+            _push(new_stack, start, end, prefix)
+            new_entry = next(new_entries, None)
+        else:
+            _, start, end, prefix = old_entry
+            _push(old_stack, start, end, prefix)
+            _push(new_stack, start, end, new_entry[3])
+            old_entry = next(old_entries, None)
+            new_entry = next(new_entries, None)
+
+
+def _covering(stack: List[Tuple[int, CIDR]], start: int) -> Optional[CIDR]:
+    # Input is sorted, so whatever ends before start can never cover anything
+    # again and everything left on the stack covers start.
+    while stack and stack[-1][0] < start:
+        stack.pop()
+    if stack:
+        return stack[-1][1]
+    return None
+
+
+def _push(stack: List[Tuple[int, CIDR]], start: int, end: int, prefix: CIDR):
+    while stack and stack[-1][0] < start:
+        stack.pop()
+    stack.append((end, prefix))
+
+
+def _entries(source: Iterable[Any]) -> Iterator[ENTRY_T]:
+    # (sort key, first, last, prefix) with the version folded into first and
+    # last so that prefixes of different versions never overlap.
+    last_key = -1
+    for prefix in source:
+        if not isinstance(prefix, CIDR):
+            # Lines of text files, str and bytes alike, other types are
+            # passed to CIDR() as they are
+            if isinstance(prefix, (bytes, bytearray)):
+                prefix = prefix.decode()
+            if isinstance(prefix, str):
+                prefix = prefix.strip()
+                if not prefix:
+                    continue
+            prefix = CIDR(prefix)
+        version = prefix.version
+        ip = prefix.ip
+        prefix_len = prefix.prefix_len
+        start = (version << 128) | ip
+        # Same as sort_key
+        key = (start << 8) | prefix_len
+        if key <= last_key:
+            if key == last_key:
+                raise ValueError(f"duplicate prefix {prefix}")
+            raise ValueError(f"input is not sorted at {prefix}")
+        last_key = key
+        end = start | ((1 << (prefix.max_prefixlen - prefix_len)) - 1)
+        yield key, start, end, prefix
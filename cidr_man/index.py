@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+from bisect import bisect_right
+from operator import itemgetter
+
+from .cidr import CIDR, Version
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, Iterable, Iterator, List, Optional, Tuple
+
+    from .cidr import PREFIX_UNION_T
+
+    PAIR_T = Tuple[CIDR, Any]
+
+
+def sort_key(cidr: CIDR) -> int:
+    # Packs (version, ip, prefix_len) into a single integer so that ordering
+    # never has to go through CIDR's containment based rich comparisons.
+    return (cidr.version << 136) | (cidr.ip << 8) | cidr.prefix_len
+
+
+def sorted_prefixes(pairs: Iterable[Tuple[PREFIX_UNION_T, Any]]) -> List[PAIR_T]:
+    keyed = []
+    for net, value in pairs:
+        if not isinstance(net, CIDR):
+            net = CIDR(net)
+        keyed.append((sort_key(net), net, value))
+    keyed.sort(key=itemgetter(0))
+    result = []
+    last = None
+    for key, net, value in keyed:
+        if key == last:
+            raise ValueError(f"duplicate prefix {net}")
+        last = key
+        result.append((net, value))
+    return result
+
+
+class _Node:
+    __slots__ = ("prefix", "value", "last", "keys", "children")
+
+    def __init__(self, prefix: CIDR, value: Any):
+        self.prefix = prefix
+        self.value = value
+        host_bits = prefix.max_prefixlen - prefix.prefix_len
+        self.last = prefix.ip | ((1 << host_bits) - 1)
+        self.keys = []
+        self.children = []
+
+
+class _Root:
+    __slots__ = ("keys", "children")
+
+    def __init__(self):
+        self.keys = []
+        self.children = []
+
+
+class PrefixIndex:
+    __roots: dict
+    __size: int
+
+    def __init__(self):
+        self.__roots = {Version.v4: _Root(), Version.v6: _Root()}
+        self.__size = 0
+
+    @classmethod
+    def from_sorted(cls, pairs: Iterable[PAIR_T]) -> "PrefixIndex":
+        index = cls()
+        roots = index.__roots
+        stack = []
+        last_key = -1
+        size = 0
+        for net, value in pairs:
+            if not isinstance(net, CIDR):
+                net = CIDR(net)
+            key = sort_key(net)
+            if key <= last_key:
+                if key == last_key:
+                    raise ValueError(f"duplicate prefix {net}")
+                raise ValueError(f"input is not sorted at {net}")
+            if (key >> 136) != (last_key >> 136):
+                stack = []
+            last_key = key
+            ip = net.ip
+            while stack and stack[-1].last < ip:
+                stack.pop()
+            parent = stack[-1] if stack else roots[net.version]
+            node = _Node(net, value)
+            parent.keys.append(ip)
+            parent.children.append(node)
+            stack.append(node)
+            size += 1
+        index.__size = size
+        return index
+
+    @classmethod
+    def from_unsorted(
+        cls, pairs: Iterable[Tuple[PREFIX_UNION_T, Any]]
+    ) -> "PrefixIndex":
+        return cls.from_sorted(sorted_prefixes(pairs))
+
+    def lookup(self, address: PREFIX_UNION_T) -> Optional[PAIR_T]:
+        node = self._longest_match(address)
+        if node is None:
+            return None
+        return node.prefix, node.value
+
+    def get(self, prefix: PREFIX_UNION_T, default: Any = None) -> Any:
+        node = self._exact_match(prefix)
+        if node is None:
+            return default
+        return node.value
+
+    def _longest_match(self, address: PREFIX_UNION_T) -> Optional[_Node]:
+        if not isinstance(address, CIDR):
+            address = CIDR(address)
+        ip = address.ip
+        prefix_len = address.prefix_len
+        parent = self.__roots[address.version]
+        best = None
+        while True:
+            i = bisect_right(parent.keys, ip) - 1
+            if i < 0:
+                return best
+            node = parent.children[i]
+            if node.last < ip or node.prefix.prefix_len > prefix_len:
+                return best
+            best = node
+            parent = node
+
+    def _exact_match(self, prefix: PREFIX_UNION_T) -> Optional[_Node]:
+        if not isinstance(prefix, CIDR):
+            prefix = CIDR(prefix)
+        node = self._longest_match(prefix)
+        if node is not None and node.prefix.prefix_len == prefix.prefix_len:
+            return node
+        return None
+
+    def items(self) -> Iterator[PAIR_T]:
+        for version in (Version.v4, Version.v6):
+            stack = list(reversed(self.__roots[version].children))
+            while stack:
+                node = stack.pop()
+                yield node.prefix, node.value
+                stack.extend(reversed(node.children))
+
+    def __iter__(self) -> Iterator[CIDR]:
+        for prefix, _ in self.items():
+            yield prefix
+
+    def __contains__(self, prefix: PREFIX_UNION_T) -> bool:
+        return self._exact_match(prefix) is not None
+
+    def __getitem__(self, prefix: PREFIX_UNION_T) -> Any:
+        node = self._exact_match(prefix)
+        if node is None:
+            raise KeyError(prefix)
+        return node.value
+
+    def __len__(self) -> int:
+        return self.__size
@@ -0,0 +1,196 @@
+from collections import Counter
+from contextlib import contextmanager
+from threading import Lock
+from typing import Dict, Iterator
+
+from . import cidr as _cidr
+from .cidr import CIDR
+
+# Instrumentation works by swapping counting wrappers onto CIDR while it is
+# enabled and restoring the original attributes afterwards, so there is no
+# cost at all (not even a flag check) while it is disabled.
+#
+# The counters are process global: every thread and asyncio task counts
+# into the same Counter while instrumentation is enabled. enable() and
+# disable() are reference counted, so the wrappers stay installed until the
+# last user (e.g. the last of several overlapping captures) has left.
+
+FLAGS = (
+    "is_global",
+    "is_private",
+    "is_reserved",
+    "is_link_local",
+    "is_loopback",
+    "is_multicast",
+)
+# Properties that build their result in place instead of through
+# from_normalized, counted as construct.normalized all the same
+CONVERSIONS = ("ipv4_mapped", "sixtofour")
+CACHES = ("_convert_str", "_convert_builtin")
+_KINDS = {
+    str: "str",
+    int: "int",
+    bytes: "bytes",
+    bytearray: "bytes",
+    memoryview: "bytes",
+    type(None): "none",
+}
+
+counters = Counter()
+_originals = {}
+_cache_baseline = {}
+_users = 0
+_lock = Lock()
+
+
+def is_enabled() -> bool:
+    return bool(_originals)
+
+
+def enable():
+    global _users
+    with _lock:
+        _users += 1
+        if _users == 1:
+            _install()
+
+
+def disable():
+    global _users
+    with _lock:
+        if _users == 0:
+            return
+        _users -= 1
+        if _users == 0:
+            _uninstall()
+
+
+def _install():
+    for name in (
+        "__init__",
+        "from_normalized",
+        "from_buffer",
+        "copy",
+        *FLAGS,
+        *CONVERSIONS,
+    ):
+        _originals[name] = CIDR.__dict__[name]
+    CIDR.__init__ = _counting_init(_originals["__init__"])
+    CIDR.from_normalized = _counting_from_normalized(_originals["from_normalized"])
+    CIDR.from_buffer = _counting_from_buffer(_originals["from_buffer"])
+    CIDR.copy = _counting_copy(_originals["copy"])
+    for name in FLAGS:
+        setattr(CIDR, name, _counting_flag(name, _originals[name]))
+    for name in CONVERSIONS:
+        setattr(CIDR, name, _counting_conversion(_originals[name]))
+    if not _cache_baseline:
+        _reset_cache_baseline()
+
+
+def _uninstall():
+    for name, original in _originals.items():
+        setattr(CIDR, name, original)
+    _originals.clear()
+
+
+def reset():
+    counters.clear()
+    _reset_cache_baseline()
+
+
+def snapshot() -> Dict[str, int]:
+    result = dict(counters)
+    for name in CACHES:
+        info = getattr(_cidr, name).cache_info()
+        hits, misses = _cache_baseline.get(name, (0, 0))
+        result[f"cache.{name.lstrip('_')}.hits"] = info.hits - hits
+        result[f"cache.{name.lstrip('_')}.misses"] = info.misses - misses
+    return result
+
+
+@contextmanager
+def capture() -> Iterator[Counter]:
+    # Collects the counters for the enclosed block into the yielded Counter
+    # when the block exits. Usable as a decorator, and safe to nest or to
+    # overlap with other captures. As the counters are process global, the
+    # result includes whatever other threads or tasks did in the meantime.
+    result = Counter()
+    enable()
+    before = snapshot()
+    try:
+        yield result
+    finally:
+        after = snapshot()
+        disable()
+        for key, value in after.items():
+            delta = value - before.get(key, 0)
+            if delta:
+                result[key] = delta
+
+
+def _reset_cache_baseline():
+    for name in CACHES:
+        info = getattr(_cidr, name).cache_info()
+        _cache_baseline[name] = (info.hits, info.misses)
+
+
+def _counting_init(original):
+    def __init__(self, net=None, version=None, prefix_len=-1):
+        counters["construct." + _KINDS.get(type(net), "builtin")] += 1
+        original(self, net, version, prefix_len)
+
+    return __init__
+
+
+def _counting_from_normalized(original):
+    function = original.__func__
+
+    def from_normalized(cls, ip, version, prefix_len):
+        counters["construct.normalized"] += 1
+        return function(cls, ip, version, prefix_len)
+
+    return classmethod(from_normalized)
+
+
+def _counting_from_buffer(original):
+    function = original.__func__
+
+    def from_buffer(cls, buf, version, count=1, stride=0, offset=0):
+        result = function(cls, buf, version, count, stride, offset)
+        counters["construct.buffer"] += len(result)
+        return result
+
+    return classmethod(from_buffer)
+
+
+def _counting_copy(original):
+    def copy(self):
+        counters["copy"] += 1
+        return original(self)
+
+    return copy
+
+
+def _counting_conversion(original: property):
+    def getter(self):
+        result = original.fget(self)
+        if result is not None:
+            counters["construct.normalized"] += 1
+        return result
+
+    return property(getter)
+
+
+def _counting_flag(name: str, original: property):
+    cache = f"_{name}"
+    computed = f"flags.{name}.computed"
+    cached = f"flags.{name}.cached"
+
+    def getter(self):
+        if getattr(self, cache) is None:
+            counters[computed] += 1
+        else:
+            counters[cached] += 1
+        return original.fget(self)
+
+    return property(getter)
@@ -0,0 +1,137 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from ipaddress import ip_address
+
+import pytest
+
+from cidr_man import CIDR, PrefixIndex
+from cidr_man.aio import enrich, enrich_batch, process_executor
+
+INDEX = PrefixIndex.from_unsorted(
+    [
+        ("10.0.0.0/8", "rfc1918"),
+        ("10.1.0.0/16", "site"),
+        ("2001:db8::/32", "doc"),
+    ]
+)
+
+
+async def source(records, fail=False):
+    for record in records:
+        await asyncio.sleep(0)
+        yield record
+    if fail:
+        raise RuntimeError("source failed")
+
+
+async def collect(*args, **kwargs):
+    return [result async for result in enrich(*args, **kwargs)]
+
+
+def test_enrich_batch():
+    results = enrich_batch(INDEX, ["10.1.2.3\n", b"2001:db8::1", "bogus", "8.8.8.8"])
+    assert results[0] == ("10.1.2.3\n", CIDR("10.1.2.3"), (CIDR("10.1.0.0/16"), "site"))
+    assert results[1][2] == (CIDR("2001:db8::/32"), "doc")
+    assert results[2] == ("bogus", None, None)
+    assert results[3] == ("8.8.8.8", CIDR("8.8.8.8"), None)
+
+
+def test_enrich_parse():
+    results = enrich_batch(INDEX, ["GET 10.9.9.9 200"], parse=lambda r: r.split()[1])
+    assert results[0][2] == (CIDR("10.0.0.0/8"), "rfc1918")
+
+
+def test_enrich_preserves_order():
+    records = [f"10.{i % 3}.0.{i % 250}" for i in range(1000)]
+    with ThreadPoolExecutor(2) as executor:
+        results = asyncio.run(
+            collect(
+                source(records),
+                INDEX,
+                batch_size=64,
+                max_pending=3,
+                offload_threshold=32,
+                executor=executor,
+            )
+        )
+    assert [record for record, _, _ in results] == records
+    for record, address, match in results:
+        expected = "site" if record.startswith("10.1.") else "rfc1918"
+        assert match[1] == expected
+
+
+def test_enrich_inline_small_batches():
+    results = asyncio.run(collect(source(["10.1.0.1", "1.1.1.1"]), INDEX))
+    assert [match for _, _, match in results] == [(CIDR("10.1.0.0/16"), "site"), None]
+
+
+def test_enrich_source_error():
+    with pytest.raises(RuntimeError):
+        asyncio.run(collect(source(["10.1.0.1"] * 10, fail=True), INDEX, batch_size=3))
+
+
+def test_enrich_early_exit():
+    async def first():
+        async for result in enrich(source(["10.1.0.1"] * 100), INDEX, batch_size=4):
+            return result
+
+    assert asyncio.run(first())[2] == (CIDR("10.1.0.0/16"), "site")
+
+
+def test_enrich_unparsable_types():
+    records = [None, 1.5, {"ip": "10.0.0.1"}, ip_address("10.1.0.1"), bytearray(b"::1")]
+    results = enrich_batch(INDEX, records)
+    assert [address for _, address, _ in results[:3]] == [None, None, None]
+    assert results[3][2] == (CIDR("10.1.0.0/16"), "site")
+    assert results[4][1] == CIDR("::1")
+
+
+def test_enrich_parse_returning_none():
+    # None must not turn into CIDR(None), which is 0.0.0.0/0
+    results = enrich_batch(
+        INDEX, ["10.1.0.1", "-"], parse=lambda r: r if r != "-" else None
+    )
+    assert results[0][2] == (CIDR("10.1.0.0/16"), "site")
+    assert results[1] == ("-", None, None)
+
+
+def test_enrich_parse_raising():
+    results = enrich_batch(
+        INDEX, ["10.1.0.1 GET", "", "\n"], parse=lambda line: line.split()[0]
+    )
+    assert results[0][2] == (CIDR("10.1.0.0/16"), "site")
+    assert results[1:] == [("", None, None), ("\n", None, None)]
+
+
+def test_enrich_invalid_arguments():
+    with pytest.raises(ValueError):
+        asyncio.run(collect(source(["10.1.0.1"]), INDEX, max_pending=0))
+    with pytest.raises(ValueError):
+        asyncio.run(collect(source(["10.1.0.1"]), INDEX, batch_size=0))
+
+
+PICKLED = []
+
+
+class CountingIndex(PrefixIndex):
+    def __reduce_ex__(self, protocol):
+        PICKLED.append(1)
+        return super().__reduce_ex__(protocol)
+
+
+def test_enrich_process_executor_ships_index_once():
+    index = CountingIndex.from_unsorted([("10.0.0.0/8", "rfc1918")])
+    records = [f"10.0.0.{i % 250}" for i in range(200)]
+    with process_executor(index, max_workers=1) as executor:
+        results = asyncio.run(
+            collect(
+                source(records),
+                index,
+                batch_size=20,
+                offload_threshold=10,
+                executor=executor,
+            )
+        )
+    assert [match[1] for _, _, match in results] == ["rfc1918"] * 200
+    # At most once for the worker's initializer, not once per batch
+    assert len(PICKLED) <= 1
@@ -0,0 +1,125 @@
+from random import Random
+
+import pytest
+
+from cidr_man import CIDR, Allocator
+
+
+def strings(prefixes):
+    return [str(prefix) for prefix in prefixes]
+
+
+def test_allocate_first_free():
+    allocator = Allocator("192.0.2.0/24")
+    assert str(allocator.allocate(26)) == "192.0.2.0/26"
+    assert str(allocator.allocate(26)) == "192.0.2.64/26"
+    assert str(allocator.allocate(25)) == "192.0.2.128/25"
+    assert len(allocator) == 3
+    with pytest.raises(ValueError):
+        allocator.allocate(32)
+
+
+def test_allocate_best_fit():
+    allocator = Allocator("192.0.2.0/24")
+    first = allocator.allocate(26)
+    allocator.allocate(25)
+    allocator.release(first)
+    # The free /26 is used before splitting anything larger
+    assert str(allocator.allocate(27)) == "192.0.2.0/27"
+    assert strings(allocator.free()) == ["192.0.2.32/27", "192.0.2.64/26"]
+
+
+def test_allocate_invalid_prefix_len():
+    allocator = Allocator("192.0.2.0/24")
+    with pytest.raises(ValueError):
+        allocator.allocate(23)
+    with pytest.raises(ValueError):
+        allocator.allocate(33)
+
+
+def test_release_merges_buddies():
+    allocator = Allocator("2001:db8::/48")
+    prefixes = [allocator.allocate(64) for _ in range(4)]
+    assert strings(prefixes)[-1] == "2001:db8:0:3::/64"
+    for prefix in reversed(prefixes):
+        allocator.release(prefix)
+    assert strings(allocator.free()) == ["2001:db8::/48"]
+    assert len(allocator) == 0
+
+
+def test_release_not_allocated():
+    allocator = Allocator("192.0.2.0/24")
+    allocator.allocate(25)
+    with pytest.raises(ValueError):
+        allocator.release("192.0.2.0/26")
+    with pytest.raises(ValueError):
+        allocator.release("198.51.100.0/25")
+    with pytest.raises(ValueError):
+        allocator.release("2001:db8::/64")
+
+
+def test_reserve():
+    allocator = Allocator("192.0.2.0/24")
+    assert allocator.reserve("192.0.2.64/26") == CIDR("192.0.2.64/26")
+    assert strings(allocator.free()) == ["192.0.2.0/26", "192.0.2.128/25"]
+    with pytest.raises(ValueError):
+        allocator.reserve("192.0.2.64/27")
+    with pytest.raises(ValueError):
+        allocator.reserve("192.0.2.0/24")
+    assert str(allocator.allocate(26)) == "192.0.2.0/26"
+
+
+def test_free_space_covers_pool():
+    allocator = Allocator("10.0.0.0/16")
+    for prefix_len in (24, 20, 30, 17, 24, 32):
+        allocator.allocate(prefix_len)
+    total = sum(prefix.num_addresses for prefix in allocator.free())
+    total += sum(prefix.num_addresses for prefix in allocator)
+    assert total == 1 << 16
+
+
+def test_round_trip():
+    allocator = Allocator("2001:db8::/48")
+    for prefix_len in (64, 56, 64, 60):
+        allocator.allocate(prefix_len)
+    data = allocator.to_bytes()
+    assert len(data) == 2 + 16 + 4 * 17
+    restored = Allocator.from_bytes(data)
+    assert restored.pool == allocator.pool
+    assert strings(restored) == strings(allocator)
+    assert strings(restored.free()) == strings(allocator.free())
+
+
+def test_from_bytes_invalid():
+    with pytest.raises(ValueError):
+        Allocator.from_bytes(b"\x05\x18\xc0\x00\x02\x00")
+    with pytest.raises(ValueError):
+        Allocator.from_bytes(b"\x04\x18\xc0\x00\x02")
+
+
+def test_random_churn_stays_consistent():
+    random = Random(34)
+    allocator = Allocator("10.0.0.0/16")
+    allocated = []
+    for _ in range(2000):
+        if allocated and random.random() < 0.45:
+            allocator.release(allocated.pop(random.randrange(len(allocated))))
+            continue
+        prefix_len = random.randint(20, 30)
+        free = [net for net in allocator.free() if net.prefix_len <= prefix_len]
+        if not free:
+            with pytest.raises(ValueError):
+                allocator.allocate(prefix_len)
+            continue
+        # Best fit, then lowest address
+        longest = max(net.prefix_len for net in free)
+        expected = min(net.ip for net in free if net.prefix_len == longest)
+        prefix = allocator.allocate(prefix_len)
+        assert prefix.ip == expected
+        allocated.append(prefix)
+    free = allocator.free()
+    assert sum(net.num_addresses for net in free + list(allocator)) == 1 << 16
+    assert strings(Allocator.from_bytes(allocator.to_bytes()).free()) == strings(free)
+    for prefix in allocated:
+        allocator.release(prefix)
+    assert strings(allocator.free()) == ["10.0.0.0/16"]
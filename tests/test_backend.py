@@ -0,0 +1,12 @@
+import os
+
+import pytest
+
+from cidr_man import cidr
+
+
+@pytest.mark.skipif(
+    "CIDR_MAN_COMPILED" not in os.environ, reason="backend not pinned by CI"
+)
+def test_backend():
+    assert cidr.COMPILED == (os.environ["CIDR_MAN_COMPILED"] == "1")
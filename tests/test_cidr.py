@@ -1,4 +1,9 @@
-from cidr_man.cidr import CIDR
+from array import array
+
+import pytest
+
+from cidr_man.cidr import CIDR, Version, common_prefix_len, common_prefix_lens
+from cidr_man.cidr import common_supernet
 
 
 def test_cidr_init_empty():
@@ -56,6 +61,10 @@ def test_cidr_supernet():
     assert sup.ip == 3221225984
     assert sup.compressed == "192.0.2.0/24"
     assert sup == CIDR("192.0.2.0/24")
+    with pytest.raises(ValueError):
+        CIDR("0.0.0.0/0").supernet()
+    with pytest.raises(ValueError):
+        CIDR("::/0").supernet()
 
 
 def test_cidr_left():
@@ -66,6 +75,10 @@ def test_cidr_left():
     assert left.ip == 0
     assert left.compressed == "0.0.0.0/1"
     assert left.packed == b"\0\0\0\0"
+    with pytest.raises(ValueError):
+        CIDR("1.2.3.4").left
+    with pytest.raises(ValueError):
+        CIDR("2001:db8::1").left
 
 
 def test_cidr_right():
@@ -76,6 +89,10 @@ def test_cidr_right():
     assert right.ip == 2147483648
     assert right.compressed == "128.0.0.0/1"
     assert right.packed == b"\x80\0\0\0"
+    with pytest.raises(ValueError):
+        CIDR("1.2.3.4").right
+    with pytest.raises(ValueError):
+        CIDR("1.2.3.4").subnets()
 
 
 def test_cidr_contains():
@@ -159,3 +176,155 @@ def test_cidr_v6_contains():
     assert left in a
     assert left.left.left in a
     assert right.right.right in a
+
+
+def test_cidr_from_normalized():
+    a = CIDR.from_normalized(3221225984, Version.v4, 24)
+    assert a == CIDR("192.0.2.0/24")
+    assert a.compressed == "192.0.2.0/24"
+    assert a.max_prefixlen == 32
+    assert a.is_private
+    assert CIDR.from_normalized(1, 6, 128).version is Version.v6
+    with pytest.raises(ValueError):
+        CIDR.from_normalized(1, 5, 32)
+
+
+def test_cidr_arithmetic():
+    a = CIDR("192.0.2.255")
+    assert a + 1 == CIDR("192.0.3.0")
+    assert 1 + a == CIDR("192.0.3.0")
+    assert a - 255 == CIDR("192.0.2.0")
+    assert CIDR("192.0.2.0/24") + 5 == CIDR("192.0.2.5")
+    assert CIDR("192.0.3.0") - a == 1
+    assert CIDR("2001:db8::ffff") + 1 == CIDR("2001:db8::1:0")
+    with pytest.raises(ValueError):
+        CIDR("255.255.255.255") + 1
+    with pytest.raises(ValueError):
+        CIDR("0.0.0.0") - 1
+    with pytest.raises(ValueError):
+        CIDR("::1") - CIDR("0.0.0.1")
+
+
+def test_cidr_next_prev_prefix():
+    a = CIDR("192.0.2.0/24")
+    assert a.next_prefix() == CIDR("192.0.3.0/24")
+    assert a.prev_prefix() == CIDR("192.0.1.0/24")
+    assert CIDR("2001:db8::/48").next_prefix() == CIDR("2001:db8:1::/48")
+    with pytest.raises(ValueError):
+        CIDR("255.255.255.0/24").next_prefix()
+    with pytest.raises(ValueError):
+        CIDR("0.0.0.0/24").prev_prefix()
+
+
+def test_cidr_sibling():
+    assert CIDR("192.0.2.0/25").sibling == CIDR("192.0.2.128/25")
+    assert CIDR("192.0.2.128/25").sibling == CIDR("192.0.2.0/25")
+    assert CIDR("2001:db8::/33").sibling == CIDR("2001:db8:8000::/33")
+    with pytest.raises(ValueError):
+        CIDR("0.0.0.0/0").sibling
+
+
+def test_cidr_ancestor():
+    a = CIDR("192.0.2.130")
+    assert a.ancestor(24) == CIDR("192.0.2.0/24")
+    assert a.ancestor(0) == CIDR("0.0.0.0/0")
+    assert a.ancestor(32) == a
+    assert CIDR("2001:db8:1234::/48").ancestor(32) == CIDR("2001:db8::/32")
+    with pytest.raises(ValueError):
+        CIDR("192.0.2.0/24").ancestor(25)
+
+
+def test_common_prefix_len():
+    assert common_prefix_len("10.0.0.0/24", "10.0.1.0/24") == 23
+    assert common_prefix_len(CIDR("10.0.0.0/8"), CIDR("10.0.0.0/24")) == 8
+    assert common_prefix_len("192.0.2.1", "192.0.2.1") == 32
+    assert common_prefix_len("0.0.0.0", "128.0.0.0") == 0
+    assert common_prefix_len("2001:db8::/48", "2001:db8:1::/48") == 47
+    with pytest.raises(ValueError):
+        common_prefix_len("10.0.0.0/8", "2001:db8::/32")
+
+
+def test_common_supernet():
+    assert str(common_supernet("10.0.0.0/24", "10.0.1.0/24", "10.0.3.7")) == (
+        "10.0.0.0/22"
+    )
+    assert str(common_supernet("10.0.0.0/24", "10.0.0.0/8")) == "10.0.0.0/8"
+    assert str(common_supernet("0.0.0.0", "255.255.255.255")) == "0.0.0.0/0"
+    assert str(common_supernet("2001:db8::1")) == "2001:db8::1"
+    with pytest.raises(ValueError):
+        common_supernet()
+    with pytest.raises(ValueError):
+        common_supernet("10.0.0.0/8", "2001:db8::/32")
+
+
+def test_common_supernet_matches_supernet_walk():
+    nets = [CIDR(f"10.{i}.{i * 7 % 256}.0/24") for i in range(0, 200, 13)]
+    for a, b in zip(nets, nets[1:]):
+        walk = a
+        while b not in walk:
+            walk = walk.supernet()
+        assert common_supernet(a, b) == walk
+        assert common_prefix_len(a, b) == walk.prefix_len
+
+
+def test_common_prefix_lens():
+    nets = ["10.0.0.0/24", "10.0.1.0/24", "11.0.0.0/8", "2001:db8::/32"]
+    assert common_prefix_lens(nets) == [23, 7, -1]
+    assert common_prefix_lens(nets[:1]) == []
+
+
+def test_cidr_from_buffer_types():
+    packet = bytearray(b"\x00\x00\xc0\x00\x02\x01\x00")
+    assert str(CIDR(bytearray(b"\xc0\x00\x02\x01"))) == "192.0.2.1"
+    assert str(CIDR(memoryview(packet)[2:6])) == "192.0.2.1"
+    assert str(CIDR(memoryview(packet)[2:6], prefix_len=24)) == "192.0.2.0/24"
+    v6 = CIDR("2001:db8::1").packed
+    assert str(CIDR(memoryview(b"\xff" + v6)[1:])) == "2001:db8::1"
+    assert str(CIDR(array("B", [192, 0, 2, 1]))) == "192.0.2.1"
+    assert str(CIDR(array("B", v6), prefix_len=32)) == "2001:db8::/32"
+    with pytest.raises(ValueError):
+        CIDR(b"\xc0\x00\x02")
+    with pytest.raises(TypeError):
+        CIDR(1.5)
+
+
+def test_cidr_from_buffer():
+    # Fixed size records of a 2 byte header, an address and 2 trailing bytes
+    records = b"".join(
+        b"\xaa\xbb" + CIDR(f"192.0.2.{i}").packed + b"\xcc\xdd" for i in range(5)
+    )
+    result = CIDR.from_buffer(records, Version.v4, 5, stride=8, offset=2)
+    assert [str(cidr) for cidr in result] == [f"192.0.2.{i}" for i in range(5)]
+    assert result[0] == CIDR("192.0.2.0")
+    assert result[0].is_private
+    assert CIDR.from_buffer(memoryview(records), Version.v4, 2, 8, 2) == result[:2]
+    assert CIDR.from_buffer(records, Version.v4, 0) == []
+    with pytest.raises(ValueError):
+        CIDR.from_buffer(records, Version.v4, 6, stride=8, offset=2)
+    with pytest.raises(ValueError):
+        CIDR.from_buffer(records, Version.v4, 2, stride=3)
+
+
+def test_cidr_from_buffer_items_wider_than_bytes():
+    # Lengths are in bytes, not items
+    words = array("I", [0] * 8)
+    assert len(CIDR.from_buffer(words, Version.v4, 8)) == 8
+    assert len(CIDR.from_buffer(words, Version.v6, 2)) == 2
+    with pytest.raises(ValueError):
+        CIDR.from_buffer(words, Version.v4, 9)
+
+
+def test_cidr_from_buffer_v6():
+    addresses = ["2001:db8::1", "::1", "ffff:ffff:ffff:ffff:ffff:ffff:ffff:ffff"]
+    packed = bytearray(b"".join(CIDR(address).packed for address in addresses))
+    result = CIDR.from_buffer(packed, Version.v6, 3)
+    assert [str(cidr) for cidr in result] == addresses
+    assert all(cidr.prefix_len == 128 for cidr in result)
+
+
+def test_cidr_from_buffer_int_version():
+    result = CIDR.from_buffer(b"\xc0\x00\x02\x01" * 2, 4, 2)
+    assert [cidr.version for cidr in result] == [Version.v4, Version.v4]
+    assert all(cidr.version is Version.v4 for cidr in result)
+    with pytest.raises(ValueError):
+        CIDR.from_buffer(b"\xc0\x00\x02\x01", 5)
@@ -0,0 +1,103 @@
+from ipaddress import IPv4Address, IPv6Address
+
+import pytest
+
+from cidr_man import CIDR
+from cidr_man.cidr import normalize_ipv4
+
+
+def test_ipv4_mapped():
+    cidr = CIDR("::ffff:192.0.2.1")
+    builtin = IPv6Address("::ffff:192.0.2.1")
+    assert cidr.ipv4_mapped == CIDR(builtin.ipv4_mapped)
+    assert CIDR("::ffff:192.0.2.0/120").ipv4_mapped == CIDR("192.0.2.0/24")
+    assert CIDR("2001:db8::1").ipv4_mapped is None
+    assert CIDR("192.0.2.1").ipv4_mapped is None
+
+
+def test_to_ipv4_mapped():
+    assert CIDR("192.0.2.1").to_ipv4_mapped() == CIDR("::ffff:192.0.2.1")
+    assert CIDR("192.0.2.0/24").to_ipv4_mapped() == CIDR("::ffff:192.0.2.0/120")
+    with pytest.raises(ValueError):
+        CIDR("2001:db8::1").to_ipv4_mapped()
+
+
+def test_sixtofour():
+    cidr = CIDR("2002:c000:201::1")
+    builtin = IPv6Address("2002:c000:201::1")
+    assert cidr.sixtofour == CIDR(builtin.sixtofour)
+    assert CIDR("2002:c000:200::/40").sixtofour == CIDR("192.0.2.0/24")
+    assert CIDR("2001:db8::1").sixtofour is None
+    assert CIDR("192.0.2.1").to_sixtofour() == CIDR("2002:c000:201::/48")
+
+
+def test_teredo():
+    cidr = CIDR("2001:0:4136:e378:8000:63bf:3fff:fdd2")
+    builtin = IPv6Address("2001:0:4136:e378:8000:63bf:3fff:fdd2")
+    server, client = builtin.teredo
+    assert cidr.teredo == (CIDR(server), CIDR(client))
+    assert CIDR("2001:db8::1").teredo is None
+    assert CIDR("2001::/32").teredo is None
+    assert CIDR("2001:0:4136:e378::/64").teredo is None
+
+
+@pytest.mark.parametrize(
+    "prefix,embedded",
+    [
+        ("2001:db8::/32", "2001:db8:c000:221::"),
+        ("2001:db8:100::/40", "2001:db8:1c0:2:21::"),
+        ("2001:db8:122::/48", "2001:db8:122:c000:2:2100::"),
+        ("2001:db8:122:300::/56", "2001:db8:122:3c0:0:221::"),
+        ("2001:db8:122:344::/64", "2001:db8:122:344:c0:2:2100:0"),
+        ("2001:db8:122:344::/96", "2001:db8:122:344::192.0.2.33"),
+    ],
+)
+def test_nat64_rfc6052_examples(prefix, embedded):
+    address = CIDR("192.0.2.33")
+    assert address.to_nat64(prefix) == CIDR(embedded)
+    assert CIDR(embedded).nat64(prefix) == address
+
+
+def test_nat64_well_known():
+    assert CIDR("192.0.2.33").to_nat64() == CIDR("64:ff9b::192.0.2.33")
+    assert CIDR("64:ff9b::192.0.2.33").nat64() == CIDR("192.0.2.33")
+    assert CIDR("192.0.2.0/24").to_nat64() == CIDR("64:ff9b::c000:200/120")
+    assert CIDR("64:ff9b::c000:200/120").nat64() == CIDR("192.0.2.0/24")
+    assert CIDR("2001:db8::1").nat64() is None
+
+
+def test_nat64_networks_split_prefix():
+    network = CIDR("192.0.2.0/24")
+    embedded = network.to_nat64("2001:db8:100::/40")
+    assert embedded.prefix_len == 64
+    assert embedded.nat64("2001:db8:100::/40") == network
+    network = CIDR("192.0.2.16/28")
+    embedded = network.to_nat64("2001:db8:100::/40")
+    assert embedded.prefix_len == 76
+    assert embedded.nat64("2001:db8:100::/40") == network
+
+
+def test_nat64_invalid_prefix():
+    with pytest.raises(ValueError):
+        CIDR("192.0.2.33").to_nat64("2001:db8::/36")
+
+
+def test_normalize_ipv4():
+    result = normalize_ipv4(
+        [
+            "::ffff:192.0.2.1",
+            "64:ff9b::198.51.100.7",
+            "2002:cb00:7101::1",
+            "2001:db8::1",
+            CIDR("192.0.2.9"),
+            IPv4Address("203.0.113.5"),
+        ]
+    )
+    assert [str(net) for net in result] == [
+        "192.0.2.1",
+        "198.51.100.7",
+        "203.0.113.1",
+        "2001:db8::1",
+        "192.0.2.9",
+        "203.0.113.5",
+    ]
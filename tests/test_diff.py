@@ -0,0 +1,104 @@
+import io
+from ipaddress import ip_address, ip_network
+
+import pytest
+
+from cidr_man import CIDR, ChangeType, diff_prefixes, sorted_prefixes
+
+OLD = [
+    "10.0.0.0/8",
+    "10.1.0.0/16",
+    "192.0.2.0/24",
+    "198.51.100.0/24",
+    "2001:db8::/32",
+]
+NEW = [
+    "10.0.0.0/8",
+    "10.1.0.0/16",
+    "10.1.2.0/24",
+    "192.0.0.0/16",
+    "198.51.100.0/25",
+    "2001:db8::/32",
+    "2001:db8:1::/48",
+    "2001:db9::/32",
+]
+
+
+def changes(old, new):
+    return [
+        (change.type, str(change.prefix), change.related and str(change.related))
+        for change in diff_prefixes(old, new)
+    ]
+
+
+def test_diff_classification():
+    assert changes(OLD, NEW) == [
+        (ChangeType.MORE_SPECIFIC, "10.1.2.0/24", "10.1.0.0/16"),
+        (ChangeType.LESS_SPECIFIC, "192.0.0.0/16", "192.0.2.0/24"),
+        (ChangeType.WITHDRAWN, "192.0.2.0/24", "192.0.0.0/16"),
+        (ChangeType.WITHDRAWN, "198.51.100.0/24", None),
+        (ChangeType.MORE_SPECIFIC, "198.51.100.0/25", "198.51.100.0/24"),
+        (ChangeType.MORE_SPECIFIC, "2001:db8:1::/48", "2001:db8::/32"),
+        (ChangeType.ADDED, "2001:db9::/32", None),
+    ]
+
+
+def test_diff_reversed():
+    assert changes(NEW, OLD) == [
+        (ChangeType.WITHDRAWN, "10.1.2.0/24", "10.1.0.0/16"),
+        (ChangeType.WITHDRAWN, "192.0.0.0/16", None),
+        (ChangeType.MORE_SPECIFIC, "192.0.2.0/24", "192.0.0.0/16"),
+        (ChangeType.LESS_SPECIFIC, "198.51.100.0/24", "198.51.100.0/25"),
+        (ChangeType.WITHDRAWN, "198.51.100.0/25", "198.51.100.0/24"),
+        (ChangeType.WITHDRAWN, "2001:db8:1::/48", "2001:db8::/32"),
+        (ChangeType.WITHDRAWN, "2001:db9::/32", None),
+    ]
+
+
+def test_diff_identical_and_empty():
+    assert changes(OLD, OLD) == []
+    assert changes([], []) == []
+    # Covering prefixes only count when they are in the old snapshot
+    assert [change.type for change in diff_prefixes([], OLD)] == [
+        ChangeType.ADDED
+    ] * len(OLD)
+
+
+def test_diff_versions_do_not_overlap():
+    # ::/0 sorts after every IPv4 prefix and never covers them
+    assert changes(["0.0.0.0/0"], ["0.0.0.0/0", "::/0", "::1"]) == [
+        (ChangeType.ADDED, "::/0", None),
+        (ChangeType.ADDED, "::1", None),
+    ]
+    assert changes(["10.0.0.0/8"], ["::/0"])[0][0] == ChangeType.WITHDRAWN
+
+
+def test_diff_files():
+    old = io.StringIO("\n".join(OLD) + "\n\n")
+    new = io.BytesIO("\n".join(NEW).encode())
+    assert changes(old, new) == changes(OLD, NEW)
+    assert changes([], [bytearray(b"192.168.100.0/24\n")]) == [
+        (ChangeType.ADDED, "192.168.100.0/24", None)
+    ]
+
+
+def test_diff_sorted_prefixes():
+    old = [prefix for prefix, _ in sorted_prefixes((p, None) for p in OLD[::-1])]
+    assert changes(old, [CIDR(prefix) for prefix in NEW]) == changes(OLD, NEW)
+
+
+def test_diff_rejects_unsorted():
+    with pytest.raises(ValueError):
+        list(diff_prefixes(["10.1.0.0/16", "10.0.0.0/8"], []))
+    with pytest.raises(ValueError):
+        list(diff_prefixes([], ["10.0.0.0/8", "10.0.0.0/8"]))
+
+
+def test_diff_other_input_types():
+    old = [ip_network("10.0.0.0/8"), ip_network("2001:db8::/32")]
+    new = [167772160, ip_address("10.1.0.0"), ip_network("2001:db8::/32")]
+    assert changes(old, new) == [
+        (ChangeType.WITHDRAWN, "10.0.0.0/8", None),
+        (ChangeType.MORE_SPECIFIC, "10.0.0.0", "10.0.0.0/8"),
+        (ChangeType.MORE_SPECIFIC, "10.1.0.0", "10.0.0.0/8"),
+    ]
@@ -0,0 +1,94 @@
+import os
+
+import pytest
+
+from cidr_man import CIDR, PrefixIndex, sorted_prefixes
+
+
+def build_index():
+    return PrefixIndex.from_unsorted(
+        [
+            ("192.0.2.0/24", "doc-1"),
+            ("10.0.0.0/8", "rfc1918"),
+            ("10.1.0.0/16", "site"),
+            ("10.1.2.0/24", "rack"),
+            ("10.2.0.0/16", "site-2"),
+            ("2001:db8::/32", "doc-v6"),
+            ("2001:db8:1::/48", "customer"),
+        ]
+    )
+
+
+def test_sorted_prefixes_order():
+    result = sorted_prefixes(
+        [
+            (CIDR("10.1.0.0/16"), 1),
+            (CIDR("2001:db8::/32"), 2),
+            (CIDR("10.0.0.0/8"), 3),
+            (CIDR("10.0.0.0/16"), 4),
+            (CIDR("9.0.0.0/8"), 5),
+        ]
+    )
+    assert [value for _, value in result] == [5, 3, 4, 1, 2]
+
+
+def test_sorted_prefixes_duplicate():
+    with pytest.raises(ValueError):
+        sorted_prefixes([("10.0.0.0/8", 1), (CIDR("10.0.0.0/8"), 2)])
+
+
+def test_from_sorted_rejects_unsorted():
+    with pytest.raises(ValueError):
+        PrefixIndex.from_sorted([(CIDR("10.1.0.0/16"), 1), (CIDR("10.0.0.0/8"), 2)])
+
+
+def test_from_sorted_rejects_duplicate():
+    with pytest.raises(ValueError):
+        PrefixIndex.from_sorted([(CIDR("10.0.0.0/8"), 1), (CIDR("10.0.0.0/8"), 2)])
+
+
+def test_longest_match():
+    index = build_index()
+    assert len(index) == 7
+    assert index.lookup("10.1.2.3") == (CIDR("10.1.2.0/24"), "rack")
+    assert index.lookup("10.1.3.3") == (CIDR("10.1.0.0/16"), "site")
+    assert index.lookup("10.3.0.1") == (CIDR("10.0.0.0/8"), "rfc1918")
+    assert index.lookup("10.2.0.0/24") == (CIDR("10.2.0.0/16"), "site-2")
+    assert index.lookup("2001:db8:1::1") == (CIDR("2001:db8:1::/48"), "customer")
+    assert index.lookup("2001:db8:2::1") == (CIDR("2001:db8::/32"), "doc-v6")
+    assert index.lookup("11.0.0.1") is None
+    assert index.lookup("8.0.0.0/6") is None
+
+
+def test_exact_match():
+    index = build_index()
+    assert index["10.1.0.0/16"] == "site"
+    assert "10.1.0.0/16" in index
+    assert "10.1.0.0/17" not in index
+    assert index.get("10.0.0.0/9") is None
+    with pytest.raises(KeyError):
+        index["10.0.0.0/9"]
+
+
+def test_items_sorted():
+    index = build_index()
+    prefixes = [str(prefix) for prefix in index]
+    assert prefixes == [
+        "10.0.0.0/8",
+        "10.1.0.0/16",
+        "10.1.2.0/24",
+        "10.2.0.0/16",
+        "192.0.2.0/24",
+        "2001:db8::/32",
+        "2001:db8:1::/48",
+    ]
+
+
+def test_children_test_data():
+    path = os.path.join(os.path.dirname(__file__), "data", "children_test_data")
+    with open(path) as f:
+        prefixes = sorted({line.strip() for line in f if line.strip()})
+    index = PrefixIndex.from_unsorted((prefix, i) for i, prefix in enumerate(prefixes))
+    assert len(index) == len(prefixes)
+    for i, prefix in enumerate(prefixes):
+        assert index[prefix] == i
@@ -0,0 +1,116 @@
+from ipaddress import ip_network
+
+from cidr_man import CIDR, instrumentation
+
+
+def test_disabled_by_default():
+    assert not instrumentation.is_enabled()
+    init = CIDR.__init__
+    with instrumentation.capture():
+        assert CIDR.__init__ is not init
+    assert CIDR.__init__ is init
+    assert not instrumentation.is_enabled()
+
+
+def test_construction_counters():
+    with instrumentation.capture() as stats:
+        CIDR("192.0.2.0/24")
+        CIDR(3221225984, 4, 24)
+        CIDR(b"\xc0\x00\x02\x01")
+        CIDR(ip_network("192.0.2.0/24"))
+        CIDR()
+    assert stats["construct.str"] == 1
+    assert stats["construct.int"] == 1
+    assert stats["construct.bytes"] == 1
+    assert stats["construct.builtin"] == 1
+    assert stats["construct.none"] == 1
+
+
+def test_buffer_counters():
+    with instrumentation.capture() as stats:
+        CIDR(memoryview(b"\xc0\x00\x02\x01"))
+        CIDR.from_buffer(b"\xc0\x00\x02\x01" * 3, 4, 3)
+    assert stats["construct.bytes"] == 1
+    assert stats["construct.buffer"] == 3
+
+
+def test_cache_counters():
+    with instrumentation.capture() as stats:
+        CIDR("198.51.100.77/32")
+        CIDR("198.51.100.77/32")
+    assert stats["cache.convert_str.hits"] >= 1
+    assert stats["cache.convert_str.misses"] <= 1
+
+
+def test_flag_counters():
+    with instrumentation.capture() as stats:
+        cidr = CIDR("10.1.2.3")
+        assert cidr.is_private
+        assert cidr.is_private
+        assert not cidr.is_multicast
+    assert stats["flags.is_private.computed"] == 1
+    assert stats["flags.is_private.cached"] == 1
+    assert stats["flags.is_multicast.computed"] == 1
+
+
+def test_copy_and_derived_counters():
+    cidr = CIDR("192.0.2.0/24")
+    with instrumentation.capture() as stats:
+        cidr.copy()
+        cidr.left
+        CIDR("::ffff:192.0.2.1").ipv4_mapped
+        CIDR("2002:c000:201::1").sixtofour
+        CIDR("2001:db8::1").sixtofour
+    assert stats["copy"] == 1
+    assert stats["construct.normalized"] == 3
+
+
+def test_nested_capture():
+    with instrumentation.capture() as outer:
+        CIDR("192.0.2.0/24")
+        with instrumentation.capture() as inner:
+            CIDR("192.0.2.0/25")
+        assert instrumentation.is_enabled()
+    assert inner["construct.str"] == 1
+    assert outer["construct.str"] == 2
+    assert not instrumentation.is_enabled()
+
+
+def test_enable_reset_snapshot():
+    instrumentation.enable()
+    try:
+        instrumentation.reset()
+        CIDR("192.0.2.0/24")
+        assert instrumentation.snapshot()["construct.str"] == 1
+    finally:
+        instrumentation.disable()
+        instrumentation.reset()
+
+
+def test_overlapping_captures():
+    # A exits while B is still running, as with concurrent requests
+    capture_a = instrumentation.capture()
+    capture_b = instrumentation.capture()
+    a = capture_a.__enter__()
+    CIDR("192.0.2.0/24")
+    b = capture_b.__enter__()
+    CIDR("198.51.100.0/24")
+    capture_a.__exit__(None, None, None)
+    assert instrumentation.is_enabled()
+    CIDR("10.0.0.0/8")
+    capture_b.__exit__(None, None, None)
+    assert a["construct.str"] == 2
+    assert b["construct.str"] == 2
+    assert not instrumentation.is_enabled()
+
+
+def test_enable_is_reference_counted():
+    instrumentation.enable()
+    instrumentation.enable()
+    instrumentation.disable()
+    assert instrumentation.is_enabled()
+    instrumentation.disable()
+    assert not instrumentation.is_enabled()
+    # Unbalanced calls do nothing
+    instrumentation.disable()
+    assert not instrumentation.is_enabled()
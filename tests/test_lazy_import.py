@@ -0,0 +1,32 @@
+import os
+import subprocess
+import sys
+
+from cidr_man import CIDR
+from cidr_man.cidr import PRIVATE, RESERVED
+
+
+def test_import_is_lazy():
+    code = (
+        "import sys, cidr_man, cidr_man.cidr; "
+        "assert 'ipaddress' not in sys.modules; "
+        "assert cidr_man.cidr._special_purpose.cache_info().currsize == 0"
+    )
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    subprocess.run([sys.executable, "-c", code], check=True, cwd=root)
+
+
+def test_special_purpose_tables():
+    assert "10.0.0.0/8" in [str(net) for net in PRIVATE]
+    assert "::ffff:0.0.0.0/96" in [str(net) for net in RESERVED]
+    assert "127.0.0.0/8" in [str(net) for net in RESERVED]
+
+
+def test_copy():
+    cidr = CIDR("10.0.0.0/8")
+    assert cidr.is_private
+    copy = cidr.copy()
+    assert copy is not cidr
+    assert copy == cidr
+    assert copy.is_private
+    assert copy.compressed == "10.0.0.0/8"